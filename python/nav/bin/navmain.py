@@ -21,35 +21,49 @@ import sys
 import os
 import os.path
 import argparse
-import textwrap
 
-from nav import colors
+_SERVICES = None
 
-try:
-    from nav.startstop import ServiceRegistry, CommandFailedError, CrontabError
-except ImportError:
-    print(
-        "Fatal error: Could not find the nav.startstop module.\nIs your "
-        "PYTHONPATH environment correctly set up?",
-        file=sys.stderr,
-    )
-    sys.exit(1)
-
-try:
-    SERVICES = ServiceRegistry()
-except (OSError, CrontabError) as _error:
-    print(
-        "A problem occurred, which prevented this command from running.\n"
-        + str(_error),
-        file=sys.stderr,
-    )
-    sys.exit(1)
+
+def _load_startstop():
+    """Imports and returns the nav.startstop names used by this program.
+
+    The import is deferred until a command actually needs to deal with
+    services, as it drags in a lot of NAV that other commands don't need.
+    """
+    try:
+        from nav.startstop import ServiceRegistry, CommandFailedError, CrontabError
+    except ImportError:
+        print(
+            "Fatal error: Could not find the nav.startstop module.\nIs your "
+            "PYTHONPATH environment correctly set up?",
+            file=sys.stderr,
+        )
+        sys.exit(1)
+    return ServiceRegistry, CommandFailedError, CrontabError
+
+
+def _services():
+    """Returns the registry of known NAV services, building it on first use"""
+    global _SERVICES
+    if _SERVICES is None:
+        ServiceRegistry, _, CrontabError = _load_startstop()
+        try:
+            _SERVICES = ServiceRegistry()
+        except (OSError, CrontabError) as error:
+            print(
+                "A problem occurred, which prevented this command from running.\n"
+                + str(error),
+                file=sys.stderr,
+            )
+            sys.exit(1)
+    return _SERVICES
 
 
 def main(args=None):
     """Main execution point"""
     if args == None:
-        parser = make_argparser()
+        parser = make_argparser(only=_sniff_subcommand(sys.argv))
         args = parser.parse_args()
     try:
         args.func(args)
@@ -58,8 +72,27 @@ def main(args=None):
         sys.exit(0)
 
 
-def make_argparser():
-    """Builds and returns an ArgumentParser instance for this program"""
+def _sniff_subcommand(argv):
+    """Returns the name of the subcommand requested in argv, if it can be
+    determined without a full parse.
+
+    None is returned if no subcommand was given, or if help was requested, in
+    which case all subcommands need to be known to the parser.
+    """
+    if '-h' in argv or '--help' in argv:
+        return None
+    for token in argv[1:]:
+        if not token.startswith('-'):
+            return token
+    return None
+
+
+def make_argparser(only=None):
+    """Builds and returns an ArgumentParser instance for this program
+
+    :param only: If set to the name of a known subcommand, only that
+                 subcommand is added to the parser.
+    """
     parser = argparse.ArgumentParser(
         description="This command is your interface to start, stop and query "
         "NAV services.",
@@ -78,20 +111,20 @@ def make_argparser():
         help="let output from subcommands pass through",
     )
 
-    self = sys.modules[__name__]
-    commands = sorted(
-        (name.replace('c_', ''), func)
-        for name, func in vars(self).items()
-        if name.startswith('c_') and callable(func)
-    )
-    all_services = sorted(SERVICES.keys())
+    known = [command for command, _func in _COMMANDS] + ["config"]
+    if only not in known:
+        only = None
+
     subparsers = parser.add_subparsers()
-    for command, func in commands:
+    for command, func in _COMMANDS:
+        if only and command != only:
+            continue
         subp = subparsers.add_parser(command, help=func.__doc__)
-        subp.add_argument("service", nargs="*", default=all_services)
+        subp.add_argument("service", nargs="*")
         subp.set_defaults(func=func)
 
-    _add_bespoke_subparsers(subparsers)
+    if not only or only == "config":
+        _add_bespoke_subparsers(subparsers)
 
     return parser
 
@@ -145,16 +178,36 @@ def verify_root():
         sys.exit(10)
 
 
-def service_iterator(query_list, func):
-    """Iterate through a list of service names, look up each service instance
-    and call func using this instance as its argument.
+def _lookup_services(query_list):
+    """Looks up a list of service names in the service registry.
+
+    :returns: A list of (name, service) tuples for the known services, and a
+              list of the unknown names. An empty query_list matches all known
+              services, sorted by name.
     """
+    svcs = _services()
+    if not query_list:
+        return sorted(svcs.items()), []
+
+    services = []
     unknowns = []
     for name in query_list:
-        if name in SERVICES:
-            func(SERVICES[name])
+        if name in svcs:
+            services.append((name, svcs[name]))
         else:
             unknowns.append(name)
+    return services, unknowns
+
+
+def service_iterator(query_list, func):
+    """Iterate through a list of service names, look up each service instance
+    and call func using this instance as its argument.
+
+    An empty query_list means all known services.
+    """
+    services, unknowns = _lookup_services(query_list)
+    for _name, service in services:
+        func(service)
     if len(unknowns):
         sys.stderr.write("Unknown services: %s\n" % " ".join(unknowns))
 
@@ -162,31 +215,30 @@ def service_iterator(query_list, func):
 def action_iterator(query_list, action, ok_string, fail_string, verbose=False):
     """Iterates through a list of service names, performing an action on each
     of them.
+
+    An empty query_list means all known services.
     """
+    from nav import colors
+
+    _, CommandFailedError, _ = _load_startstop()
+    services, unknowns = _lookup_services(query_list)
+    succeeded = []
     failed = []
-    unknowns = []
     errors = []
 
-    any_ok = False
-    for name in query_list:
-        if name in SERVICES:
-            method = getattr(SERVICES[name], action)
-            try:
-                if method(silent=not verbose):
-                    if not any_ok:
-                        any_ok = True
-                        print(ok_string + ":", end=' ')
-                    colors.print_color(name + ' ', colors.COLOR_GREEN, newline=False)
-                    sys.stdout.flush()
-                else:
-                    failed.append(name)
-            except CommandFailedError as error:
-                errors.append((name, error))
-        else:
-            unknowns.append(name)
-    if any_ok:
-        print()
-
+    for name, service in services:
+        method = getattr(service, action)
+        try:
+            if method(silent=not verbose):
+                succeeded.append(name)
+            else:
+                failed.append(name)
+        except CommandFailedError as error:
+            errors.append((name, error))
+
+    if len(succeeded):
+        print("%s:" % ok_string, end=' ')
+        colors.print_color(" ".join(succeeded), colors.COLOR_GREEN)
     if len(failed):
         print("%s:" % fail_string, end=' ')
         colors.print_color(" ".join(failed), colors.COLOR_RED)
@@ -204,12 +256,15 @@ def action_iterator(query_list, action, ok_string, fail_string, verbose=False):
 
 def c_info(args):
     """lists each service and their associated description"""
+    import textwrap
+    from nav import colors
+
     matched_services = []
     max_length = 0
     terminal_width = colors.get_terminal_width() or 79
 
     def _service_printer(service):
-        name = ("{:<%s} " % max_length).format(service.name)
+        name = name_format.format(service.name)
         colors.print_color(name, colors.COLOR_GREEN, newline=False)
 
         kind = service.__class__.__name__
@@ -219,21 +274,20 @@ def c_info(args):
         kind = "{:>8}".format(kind)
         colors.print_color(kind, colors.COLOR_YELLOW, newline=False)
 
-        indent = " " * (max_length + 11)
-        info = textwrap.wrap(
-            service.info or "N/A",
-            width=terminal_width,
-            initial_indent=indent,
-            subsequent_indent=indent,
-        )
-        info = "\n".join(info)
+        info = "\n".join(wrapper.wrap(service.info or "N/A"))
         print(": " + info.strip())
 
     def _append_to_service_list(service):
+        nonlocal max_length
         matched_services.append(service)
+        max_length = max(max_length, len(service.name))
 
     service_iterator(args.service, _append_to_service_list)
-    max_length = max(len(s.name) for s in matched_services) if matched_services else 0
+    name_format = "{:<%d} " % max_length
+    indent = " " * (max_length + 11)
+    wrapper = textwrap.TextWrapper(
+        width=terminal_width, initial_indent=indent, subsequent_indent=indent
+    )
     for svc in matched_services:
         _service_printer(svc)
 
@@ -292,6 +346,16 @@ def c_version(_args):
     print("NAV %s" % buildconf.VERSION)
 
 
+# All the c_* functions above, as (command name, function) pairs
+_COMMANDS = tuple(
+    sorted(
+        (name[2:], func)
+        for name, func in globals().items()
+        if name.startswith('c_') and callable(func)
+    )
+)
+
+
 def command_config_where(_args):
     """reports the location of NAV's main configuration file"""
     from nav.config import find_config_file, CONFIG_LOCATIONS
@@ -16,10 +16,15 @@
 #
 
 """Utility methods for django used in NAV"""
+from copy import deepcopy
+
 from django.core.exceptions import FieldDoesNotExist
+from django.db.models.signals import post_save
+from django.dispatch import receiver
 from django.urls import reverse
 from django.utils.http import urlencode
 
+from nav.compatibility import lru_cache
 from nav.models.profiles import Account, AccountGroup
 
 
@@ -31,7 +36,30 @@ def reverse_with_query(viewname, **kwargs):
 
 
 def default_account():
-    return Account.objects.get(id=Account.DEFAULT_ACCOUNT)
+    """Returns the default (anonymous) account.
+
+    The account row is only fetched from the database once per process; each
+    call returns a new Account instance, so callers are free to modify it.
+    """
+    row = _default_account_row()
+    return Account.from_db(row['db'], list(row['fields']), deepcopy(row['values']))
+
+
+@lru_cache(maxsize=1)
+def _default_account_row():
+    queryset = Account.objects.filter(id=Account.DEFAULT_ACCOUNT)
+    fields = queryset.values().get()
+    return {
+        'db': queryset.db,
+        'fields': tuple(fields.keys()),
+        'values': list(fields.values()),
+    }
+
+
+@receiver(post_save, sender=Account)
+def _clear_default_account_cache(sender, instance, **_kwargs):
+    if instance.pk == Account.DEFAULT_ACCOUNT:
+        _default_account_row.cache_clear()
 
 
 def get_account(request):
@@ -43,11 +71,20 @@ def get_account(request):
 
 
 def is_admin(account):
-    """Check if user is a member of the administrator group"""
-    return account.groups.filter(pk=AccountGroup.ADMIN_GROUP).count() > 0
+    """Check if user is a member of the administrator group.
 
+    The result is stored in the account object for later use.
+    """
+    try:
+        return account._cached_is_admin
+    except AttributeError:
+        account._cached_is_admin = account.groups.filter(
+            pk=AccountGroup.ADMIN_GROUP
+        ).exists()
+        return account._cached_is_admin
 
-def get_verbose_name(model, lookup):
+
+def _get_verbose_name(model, lookup):
     """Verbose name introspection of ORM models.
     Parameters:
       - model: the django model
@@ -74,6 +111,10 @@ def get_verbose_name(model, lookup):
     raise FieldDoesNotExist
 
 
+# Model metadata does not change at runtime, so lookups can be cached forever
+get_verbose_name = lru_cache(maxsize=1024)(_get_verbose_name)
+
+
 #
 # Django version differentiated helper functions:
 #
@@ -85,19 +126,21 @@ def get_model_and_name(rel):
     return rel.related_model, rel.name
 
 
+@lru_cache(maxsize=256)
 def get_all_related_objects(model):
     """Gets all related objects based on django version"""
-    return [
+    return tuple(
         f
         for f in model._meta.get_fields()
         if (f.one_to_many or f.one_to_one) and f.auto_created and not f.concrete
-    ]
+    )
 
 
+@lru_cache(maxsize=256)
 def get_all_related_many_to_many_objects(model):
     """Gets all related many-to-many objects based on django version"""
-    return [
+    return tuple(
         f
         for f in model._meta.get_fields(include_hidden=True)
         if f.many_to_many and f.auto_created
-    ]
+    )
@@ -150,7 +150,7 @@ class LinkStateHandler(delayedstate.DelayedStateHandler):
     #
 
     def _post_event_if_aggregate_degraded(self):
-        if self.get_target().get_aggregator():
+        if self.get_target().get_aggregator_id() is not None:
             self._logger.info(
                 "down event for %s, posting linkDegraded event for %s",
                 self.get_target(),
@@ -159,7 +159,7 @@ class LinkStateHandler(delayedstate.DelayedStateHandler):
             return self._get_aggregate_link_event(start=True)
 
     def _post_event_if_aggregate_restored(self):
-        if self.get_target().get_aggregator():
+        if self.get_target().get_aggregator_id() is not None:
             self._logger.info(
                 "up event for %s, posting linkRestored event for %s",
                 self.get_target(),
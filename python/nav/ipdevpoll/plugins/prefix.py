@@ -36,6 +36,7 @@ do.
 """
 import re
 import logging
+from collections import defaultdict
 
 from twisted.internet import defer, error
 
@@ -56,6 +57,22 @@ VLAN_PATTERN = re.compile(
 )
 
 
+def parse_vlan_interfaces(interfaces):
+    """Parses VLAN ids from the names of interfaces matching VLAN_PATTERN.
+
+    :param interfaces: A dictionary of { ifindex: ifname }
+    :returns: A dictionary of { ifindex: vlan }
+
+    """
+    match = VLAN_PATTERN.match
+    vlan_ifs = {}
+    for ifindex, ifname in interfaces.items():
+        found = match(ifname)
+        if found:
+            vlan_ifs[ifindex] = int(found.group('vlan'))
+    return vlan_ifs
+
+
 class Prefix(Plugin):
     """
     ipdevpoll-plugin for collecting prefix information from monitored
@@ -82,18 +99,18 @@ class Prefix(Plugin):
         vlan_interfaces = yield self.get_vlan_interfaces()
         ifc_aliases = yield self._get_ifc_aliases()
 
-        # Traverse address tables from IP-MIB, IPV6-MIB and
-        # CISCO-IETF-IP-MIB in that order.
+        # Retrieve the address tables from IP-MIB, IPV6-MIB and
+        # CISCO-IETF-IP-MIB in parallel, as they are independent of each other
+        mibs = (ipmib, ipv6mib, ciscoip)
+        results = yield defer.DeferredList(
+            [self._get_interface_addresses(mib, strict=mib == ipmib) for mib in mibs],
+            consumeErrors=True,
+        )
         addresses = set()
-        for mib in ipmib, ipv6mib, ciscoip:
-            self._logger.debug("Trying address tables from %s", mib.mib['moduleName'])
-            df = mib.get_interface_addresses()
-            # Special case; some devices will time out while building a bulk
-            # response outside our scope when it has no proprietary MIB support
-            if mib != ipmib:
-                df.addErrback(self._ignore_timeout, set())
-            df.addErrback(self._ignore_index_exceptions, mib)
-            new_addresses = yield df
+        for mib, (success, result) in zip(mibs, results):
+            if not success:
+                result.raiseException()
+            new_addresses = result
             self._logger.debug(
                 "Found %d addresses in %s: %r",
                 len(new_addresses),
@@ -103,6 +120,9 @@ class Prefix(Plugin):
             addresses.update(new_addresses)
 
         adminup_ifcs = yield self._get_adminup_ifcs()
+        # Group addresses by interface, as interfaces often carry several
+        # (secondary) addresses
+        interface_addresses = defaultdict(list)
         for ifindex, ip, prefix in addresses:
             if ifindex not in adminup_ifcs:
                 self._logger.debug(
@@ -112,9 +132,22 @@ class Prefix(Plugin):
             if self._prefix_should_be_ignored(prefix):
                 self._logger.debug("ignoring prefix %s as configured", prefix)
                 continue
-            self.create_containers(
-                netbox, ifindex, prefix, ip, vlan_interfaces, ifc_aliases
-            )
+            interface_addresses[ifindex].append((ip, prefix))
+
+        for ifindex, ifc_addresses in interface_addresses.items():
+            interface = self.create_interface(netbox, ifindex, ifc_aliases)
+            for ip, prefix in ifc_addresses:
+                self.create_containers(interface, prefix, ip, vlan_interfaces)
+
+    def _get_interface_addresses(self, mib, strict=True):
+        self._logger.debug("Trying address tables from %s", mib.mib['moduleName'])
+        df = mib.get_interface_addresses()
+        # Special case; some devices will time out while building a bulk
+        # response outside our scope when it has no proprietary MIB support
+        if not strict:
+            df.addErrback(self._ignore_timeout, set())
+        df.addErrback(self._ignore_index_exceptions, mib)
+        return df
 
     def _get_ifc_aliases(self):
         return IfMib(self.agent).get_ifaliases()
@@ -136,18 +169,22 @@ class Prefix(Plugin):
         result = set(ifindex for ifindex, status in statuses.items() if status == 'up')
         defer.returnValue(result)
 
-    def create_containers(
-        self, netbox, ifindex, net_prefix, ip, vlan_interfaces, ifc_aliases=None
-    ):
+    def create_interface(self, netbox, ifindex, ifc_aliases=None):
         """
-        Utitilty method for creating the shadow-objects
+        Utility method for creating the shadow-object of an interface
         """
         interface = self.containers.factory(ifindex, shadows.Interface)
         interface.ifindex = ifindex
         if ifc_aliases and ifc_aliases.get(ifindex, None):
             interface.ifalias = ifc_aliases[ifindex]
         interface.netbox = netbox
+        return interface
 
+    def create_containers(self, interface, net_prefix, ip, vlan_interfaces):
+        """
+        Utility method for creating the shadow-objects of an interface address
+        """
+        ifindex = interface.ifindex
         # No use in adding the GwPortPrefix unless we actually found a prefix
         if net_prefix:
             port_prefix = self.containers.factory(ip, shadows.GwPortPrefix)
@@ -186,14 +223,7 @@ class Prefix(Plugin):
         df.addCallback(reduce_index)
         interfaces = yield df
 
-        vlan_ifs = {}
-        for ifindex, ifname in interfaces.items():
-            match = VLAN_PATTERN.match(ifname)
-            if match:
-                vlan = int(match.group('vlan'))
-                vlan_ifs[ifindex] = vlan
-
-        defer.returnValue(vlan_ifs)
+        defer.returnValue(parse_vlan_interfaces(interfaces))
 
     def _ignore_timeout(self, failure, result=None):
         """Ignores a TimeoutError in an errback chain.
@@ -276,9 +306,13 @@ class IgnoredPrefix(IP):
         """
         assert self.match_operator in self.OPERATORS
 
+        # Collected prefixes are already IP objects, don't copy them
+        if not isinstance(prefix, IP):
+            prefix = IP(prefix)
+
         if self.match_operator == self.EQUALS_OPERATOR:
-            return IP(prefix) == self
+            return prefix == self
         elif self.match_operator == self.CONTAINED_IN_OPERATOR:
-            return IP(prefix) in self
+            return prefix in self
         else:
             return NotImplementedError
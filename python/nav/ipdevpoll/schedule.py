@@ -20,8 +20,8 @@ import logging
 import datetime
 import time
 from operator import itemgetter
-from collections import defaultdict
-from random import randint
+from collections import defaultdict, deque
+import random
 from math import ceil
 
 from twisted.python.failure import Failure
@@ -45,6 +45,10 @@ from .jobs import JobHandler, AbortedJobError, SuggestedReschedule
 
 _logger = logging.getLogger(__name__)
 
+# Failed jobs are rescheduled to run again within 5-10 minutes
+_FAILURE_DELAY_MIN = 5 * 60
+_FAILURE_DELAY_MAX = 10 * 60
+
 
 class NetboxJobScheduler(object):
     """Netbox job schedule handler.
@@ -54,11 +58,12 @@ class NetboxJobScheduler(object):
 
     """
 
-    job_counters = {}
-    job_queues = {}
+    job_counters = defaultdict(int)
+    job_queues = defaultdict(deque)
     global_job_queue = []
     global_intensity = config.ipdevpoll_conf.getint('ipdevpoll', 'max_concurrent_jobs')
     _logger = ipdevpoll.ContextLogger()
+    _random = random.Random()
 
     def __init__(self, job, netbox, pool):
         self.job = job
@@ -210,13 +215,18 @@ class NetboxJobScheduler(object):
             delay = int(failure.value.delay)
         else:
             # within 5-10 minutes, but no longer than set interval
-            delay = min(self.job.interval, randint(5 * 60, 10 * 60))
+            delay = min(
+                self.job.interval,
+                self._random.randint(_FAILURE_DELAY_MIN, _FAILURE_DELAY_MAX),
+            )
         self.reschedule(delay)
         self._log_finished_job(False)
         self._update_counters(False)
         failure.trap(AbortedJobError)
 
     def _log_finished_job(self, success=True):
+        if not self._logger.isEnabledFor(logging.INFO):
+            return
         status = "completed" if success else "failed"
         runtime = datetime.timedelta(seconds=self.get_runtime())
         next_time = self.get_time_to_next_run()
@@ -251,15 +261,15 @@ class NetboxJobScheduler(object):
             self._logger.debug("ignoring request to reschedule cancelled job")
             return
 
-        next_time = datetime.datetime.now() + datetime.timedelta(seconds=delay)
-
-        self._logger.debug(
-            "Next %r job for %s will be in %d seconds (%s)",
-            self.job.name,
-            self.netbox.sysname,
-            delay,
-            next_time,
-        )
+        if self._logger.isEnabledFor(logging.DEBUG):
+            next_time = datetime.datetime.now() + datetime.timedelta(seconds=delay)
+            self._logger.debug(
+                "Next %r job for %s will be in %d seconds (%s)",
+                self.job.name,
+                self.netbox.sysname,
+                delay,
+                next_time,
+            )
 
         if self._next_call.active():
             self._next_call.reset(delay)
@@ -281,20 +291,17 @@ class NetboxJobScheduler(object):
         return result
 
     def count_job(self):
-        current_count = self.__class__.job_counters.get(self.job.name, 0)
-        current_count += 1
-        self.__class__.job_counters[self.job.name] = current_count
+        NetboxJobScheduler.job_counters[self.job.name] += 1
         self.running = True
 
     def uncount_job(self):
-        current_count = self.__class__.job_counters.get(self.job.name, 0)
-        current_count -= 1
-        self.__class__.job_counters[self.job.name] = max(current_count, 0)
+        counters = NetboxJobScheduler.job_counters
+        counters[self.job.name] = max(counters[self.job.name] - 1, 0)
         self.running = False
         self._current_job = None
 
     def get_job_count(self):
-        return self.__class__.job_counters.get(self.job.name, 0)
+        return NetboxJobScheduler.job_counters[self.job.name]
 
     def is_job_limit_reached(self):
         "Returns True if the number of jobs >= the job intensity limit"
@@ -319,7 +326,7 @@ class NetboxJobScheduler(object):
         "Unqueues the next waiting job"
         queue = self.get_job_queue()
         if queue and not self.is_job_limit_reached():
-            handler = queue.pop(0)
+            handler = queue.popleft()
             return handler.start()
 
     @classmethod
@@ -332,9 +339,7 @@ class NetboxJobScheduler(object):
                     return handler.start()
 
     def get_job_queue(self):
-        if self.job.name not in self.job_queues:
-            self.job_queues[self.job.name] = []
-        return self.job_queues[self.job.name]
+        return NetboxJobScheduler.job_queues[self.job.name]
 
 
 class JobScheduler(object):
@@ -474,23 +479,29 @@ class JobScheduler(object):
         The handlers will be sorted by descending runtime.
 
         """
-        jobs = [
-            (
-                netbox_scheduler.netbox.sysname,
-                netbox_scheduler.job.name,
-                netbox_scheduler.get_current_runtime(),
-            )
-            for scheduler in cls.active_schedulers
-            for netbox_scheduler in scheduler.active_netboxes.values()
-            if netbox_scheduler.is_running()
-        ]
-        jobs.sort(key=itemgetter(2), reverse=True)
-        table_formatter = SimpleTableFormatter(jobs)
-
         _logger = logging.getLogger("%s.joblist" % __name__)
+        if not _logger.isEnabledFor(level):
+            return
+
+        jobs = []
+        for scheduler in cls.active_schedulers:
+            job_name = scheduler.job.name
+            for netbox_scheduler in scheduler.active_netboxes.values():
+                if netbox_scheduler.running:
+                    jobs.append(
+                        (
+                            netbox_scheduler.netbox.sysname,
+                            job_name,
+                            netbox_scheduler.get_current_runtime(),
+                        )
+                    )
+        jobs.sort(key=itemgetter(2), reverse=True)
         if jobs:
             _logger.log(
-                level, "currently active jobs (%d):\n%s", len(jobs), table_formatter
+                level,
+                "currently active jobs (%d):\n%s",
+                len(jobs),
+                SimpleTableFormatter(jobs),
             )
         else:
             _logger.log(
@@ -603,12 +603,10 @@ class ContainerRepository(dict):
         args and kwargs arguments are ignored.
 
         """
-        obj = self.get(key, container_class)
+        containers = self.setdefault(container_class, {})
+        obj = containers.get(key)
         if obj is None:
-            obj = container_class(*args, **kwargs)
-            if container_class not in self:
-                self[container_class] = {}
-            self[container_class][key] = obj
+            obj = containers[key] = container_class(*args, **kwargs)
 
         return obj
 
@@ -114,6 +114,18 @@ class CIDRField(VarcharField):
         return value
 
 
+@CIDRField.register_lookup
+class NetContainsOrEquals(models.Lookup):
+    """Matches CIDR values that contain or are equal to the given address"""
+
+    lookup_name = 'net_contains_or_equals'
+
+    def as_sql(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        rhs, rhs_params = self.process_rhs(compiler, connection)
+        return '%s >>= %s' % (lhs, rhs), lhs_params + rhs_params
+
+
 class PointField(models.CharField):
     def __init__(self, *args, **kwargs):
         kwargs['max_length'] = 100
@@ -123,7 +135,12 @@ class PointField(models.CharField):
         return 'point'
 
     def from_db_value(self, value, expression, connection):
-        return self.to_python(value)
+        if not value:
+            return value
+        # PostgreSQL always outputs points as "(x,y)", so there's no need to
+        # validate them like user input
+        latitude, longitude = value[1:-1].split(',')
+        return (Decimal(latitude), Decimal(longitude))
 
     def to_python(self, value):
         if not value or isinstance(value, tuple):
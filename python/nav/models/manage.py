@@ -24,23 +24,38 @@ import datetime as dt
 import pickle
 import warnings
 from functools import partial
-from itertools import count, groupby
 import logging
-import math
 import re
-from typing import Set, Optional
+from typing import FrozenSet, Optional
 
 import IPy
 from django.conf import settings
+from django.core.cache import cache
 from django.core.exceptions import ValidationError
-from django.db import models
-from django.db.models import JSONField, Q
+from django.db import connection, models, transaction
+from django.db.models import (
+    BigIntegerField,
+    CharField,
+    Count,
+    DateTimeField,
+    DurationField,
+    Exists,
+    ExpressionWrapper,
+    F,
+    Func,
+    JSONField,
+    OuterRef,
+    Prefetch,
+    Q,
+    Subquery,
+)
+from django.db.models.functions import Cast, Coalesce, Extract, Floor, Now
 from django.db.models.expressions import RawSQL
 from django.urls import reverse
 
 from nav import util
 from nav.adapters import HStoreField
-from nav.bitvector import BitVector
+from nav.compatibility import lru_cache
 from nav.metrics.data import get_netboxes_availability
 from nav.metrics.graphs import get_simple_graph_url, Graph
 from nav.metrics.names import get_all_leaves_below
@@ -62,6 +77,16 @@ from nav.oids import get_enterprise_id
 
 _logger = logging.getLogger(__name__)
 
+# How long to remember which Graphite metrics exist below an interface
+PORT_METRICS_CACHE_TIMEOUT = 300
+
+_EMAIL_PATTERN = re.compile(r'\b[\w.]+@[\w.]+\b')
+
+# NetboxInfo entries that hold chassis MAC addresses
+_MAC_INFO_Q = (Q(key="bridge_info") & Q(variable="base_address")) | (
+    Q(key="lldp") & Q(variable="chassis_mac")
+)
+
 #######################################################################
 ### Netbox-related models
 
@@ -79,13 +104,23 @@ class UpsManager(models.Manager):
         )
 
 
+def _shorten_sysname(sysname, ip):
+    """Strips the DOMAIN_SUFFIX from a sysname, falling back to ip if the
+    sysname is empty.
+    """
+    if settings.DOMAIN_SUFFIX is not None and sysname.endswith(settings.DOMAIN_SUFFIX):
+        return sysname[: -len(settings.DOMAIN_SUFFIX)]
+    return sysname or ip
+
+
 class NetboxQuerySet(models.QuerySet):
-    chassis_serialnum_sql = (
-        "SELECT device.serial FROM device "
-        "JOIN netboxentity ne USING (deviceid) "
-        "WHERE ne.netboxid=netbox.netboxid AND ne.physical_class=%s "
-        "ORDER BY index ASC "
-        "LIMIT 1"
+    mac_addresses_sql = (
+        "SELECT ARRAY("
+        "SELECT DISTINCT val FROM netboxinfo ni "
+        "WHERE ni.netboxid=netbox.netboxid AND ("
+        "(ni.key='bridge_info' AND ni.var='base_address') OR "
+        "(ni.key='lldp' AND ni.var='chassis_mac')"
+        "))"
     )
 
     def on_maintenance(self, on_maintenance):
@@ -94,14 +129,51 @@ class NetboxQuerySet(models.QuerySet):
         alerts = nav.models.event.AlertHistory.objects.unresolved(
             'maintenanceState'
         ).filter(variables__variable='netbox')
-        netboxes = self.filter(
-            id__in=(
-                alerts.filter(netbox__isnull=False).values_list('netbox_id', flat=True)
+        netbox_ids = alerts.filter(netbox__isnull=False).values('netbox_id')
+        if on_maintenance:
+            return self.filter(id__in=netbox_ids)
+        return self.exclude(id__in=netbox_ids)
+
+    def with_common_relations(self):
+        """Selects the foreign key relations that are commonly used when listing
+        netboxes, so they don't need to be looked up for each object.
+        """
+        return self.select_related('type', 'room', 'organization', 'category')
+
+    def with_chassis(self):
+        """Prefetches the chassis entities of every Netbox, so that
+        Netbox.device doesn't need to query the database for each object.
+        """
+        chassis = (
+            NetboxEntity.objects.filter(
+                physical_class=NetboxEntity.CLASS_CHASSIS, device__isnull=False
             )
+            .select_related('device')
+            .order_by('index')
         )
-        if on_maintenance:
-            return netboxes
-        return self.difference(netboxes)
+        return self.prefetch_related(
+            Prefetch('entities', queryset=chassis, to_attr='_chassis_entities')
+        )
+
+    def with_availability(self):
+        """Evaluates this queryset and fetches availability data for all the
+        netboxes in a single Graphite request.
+
+        :returns: A list of Netbox objects, whose get_availability() methods
+                  will return the pre-fetched data.
+        """
+        netboxes = list(self)
+        availabilities = get_netboxes_availability(netboxes)
+        for netbox in netboxes:
+            netbox._cached_availability = availabilities.get(netbox.pk)
+        return netboxes
+
+    def with_mac_addresses(self):
+        """Annotates every Netbox with its collected chassis MAC addresses, so
+        that Netbox.mac_addresses doesn't need to query the database for each
+        object.
+        """
+        return self.annotate(_mac_addresses=RawSQL(self.mac_addresses_sql, ()))
 
     def with_chassis_serials(self):
         """Annotates every Netbox with the serial number of its chassis,
@@ -111,11 +183,15 @@ class NetboxQuerySet(models.QuerySet):
 
         Each object will be annotated with the attribute `chassis_serial`
         """
-        return self.annotate(
-            chassis_serial=RawSQL(
-                self.chassis_serialnum_sql, (NetboxEntity.CLASS_CHASSIS,)
+        serials = (
+            Device.objects.filter(
+                entities__netbox=OuterRef('pk'),
+                entities__physical_class=NetboxEntity.CLASS_CHASSIS,
             )
+            .order_by('entities__index')
+            .values('serial')[:1]
         )
+        return self.annotate(chassis_serial=Subquery(serials))
 
 
 class ManagementProfile(models.Model):
@@ -307,8 +383,12 @@ class Netbox(models.Model):
 
         Returns the first chassis device if any
         """
-        for chassis in self.get_chassis().order_by('index'):
-            return chassis.device
+        try:
+            chassis = self._chassis_entities
+        except AttributeError:
+            chassis = self.get_chassis().order_by('index')[:1]
+        for entity in chassis:
+            return entity.device
 
     def get_preferred_snmp_management_profile(
         self, require_write=False
@@ -330,16 +410,17 @@ class Netbox(models.Model):
             query = query & Q(configuration__write=True)
 
         profiles = self.profiles.filter(query)
+        if not profiles:
+            return None
 
-        if not require_write:
-            # Sort read-only profiles first
-            profiles = sorted(
-                profiles, key=lambda p: p.configuration.get("write", False)
-            )
+        def _preference(profile):
+            # Highest SNMP version first, then read-only profiles before
+            # write-enabled ones (unless only write-enabled ones were requested)
+            is_write = not require_write and profile.configuration.get("write", False)
+            return -(profile.snmp_version or 0), is_write
 
-        profiles = sorted(profiles, key=lambda p: p.snmp_version or 0, reverse=True)
-        if profiles:
-            return profiles[0]
+        # min() picks the first of any equally preferable profiles
+        return min(profiles, key=_preference)
 
     def is_up(self):
         """Returns True if the Netbox isn't known to be down or in shadow"""
@@ -349,13 +430,19 @@ class Netbox(models.Model):
         """
         Returns True if this netbox has any unresolved snmp agent state alerts
         """
-        return self.get_unresolved_alerts('snmpAgentState').count() > 0
+        return self.get_unresolved_alerts('snmpAgentState').exists()
 
     def get_absolute_url(self):
+        cached = getattr(self, '_cached_absolute_url', None)
+        if cached and cached[0] == self.sysname:
+            return cached[1]
+
         kwargs = {
             'name': self.sysname,
         }
-        return reverse('ipdevinfo-details-by-name', kwargs=kwargs)
+        url = reverse('ipdevinfo-details-by-name', kwargs=kwargs)
+        self._cached_absolute_url = (self.sysname, url)
+        return url
 
     def last_updated(self, job='inventory'):
         """Returns the last updated timestamp of a particular job as a
@@ -371,26 +458,13 @@ class Netbox(models.Model):
             return None
 
     def get_last_jobs(self):
-        """Returns the last log entry for all jobs"""
-        query = """
-            SELECT
-              ijl.*
-            FROM ipdevpoll_job_log AS ijl
-            JOIN (
-                SELECT
-                  netboxid,
-                  job_name,
-                  MAX(end_time) AS end_time
-                FROM
-                  ipdevpoll_job_log
-                GROUP BY netboxid, job_name
-              ) AS foo USING (netboxid, job_name, end_time)
-            JOIN netbox ON (ijl.netboxid = netbox.netboxid)
-            WHERE ijl.netboxid = %s
-            ORDER BY end_time
-        """
-        logs = IpdevpollJobLog.objects.raw(query, [self.id])
-        return list(logs)
+        """Returns the last log entry for all jobs, ordered by end time"""
+        logs = (
+            IpdevpollJobLog.objects.filter(netbox_id=self.id)
+            .order_by('job_name', '-end_time')
+            .distinct('job_name')
+        )
+        return sorted(logs, key=lambda log: log.end_time)
 
     def get_gwport_count(self):
         """Returns the number of all interfaces that have IP addresses."""
@@ -436,9 +510,18 @@ class Netbox(models.Model):
         return Sensor.objects.filter(netbox=self)
 
     def get_availability(self):
-        """Calculates and returns an availability data structure."""
-        result = get_netboxes_availability([self])
-        return result.get(self.pk)
+        """Calculates and returns an availability data structure.
+
+        The result is stored in this object for later use. Use
+        NetboxQuerySet.with_availability() to fetch availability for many
+        netboxes at once.
+        """
+        try:
+            return self._cached_availability
+        except AttributeError:
+            result = get_netboxes_availability([self])
+            self._cached_availability = result.get(self.pk)
+            return self._cached_availability
 
     def get_week_availability(self):
         """Gets the availability for this netbox for the last week"""
@@ -450,18 +533,17 @@ class Netbox(models.Model):
 
     def get_uplinks(self):
         """Returns a list of uplinks on this netbox. Requires valid vlan."""
-        result = []
-
-        for iface in self.connected_to_interface.all():
-            if iface.swport_vlans.filter(direction=SwPortVlan.DIRECTION_DOWN).count():
-                result.append(
-                    {
-                        'other': iface,
-                        'this': iface.to_interface,
-                    }
-                )
-
-        return result
+        down_vlans = SwPortVlan.objects.filter(
+            interface=OuterRef('pk'), direction=SwPortVlan.DIRECTION_DOWN
+        )
+        ifaces = self.connected_to_interface.select_related('to_interface').annotate(
+            has_down=Exists(down_vlans)
+        )
+        return [
+            {'other': iface, 'this': iface.to_interface}
+            for iface in ifaces
+            if iface.has_down
+        ]
 
     def get_uplinks_regarding_of_vlan(self):
         result = []
@@ -507,21 +589,16 @@ class Netbox(models.Model):
 
     def get_short_sysname(self):
         """Returns sysname without the domain suffix if specified in the
-        DOMAIN_SUFFIX setting in nav.conf"""
-
-        if settings.DOMAIN_SUFFIX is not None and self.sysname.endswith(
-            settings.DOMAIN_SUFFIX
-        ):
-            return self.sysname[: -len(settings.DOMAIN_SUFFIX)]
-        else:
-            return self.sysname or self.ip
+        DOMAIN_SUFFIX setting in nav.conf.
+        """
+        return _shorten_sysname(self.sysname, self.ip)
 
     def is_on_maintenance(self):
         """Returns True if this netbox is currently on maintenance"""
         states = self.get_unresolved_alerts('maintenanceState').filter(
             variables__variable='netbox'
         )
-        return states.count() > 0
+        return states.exists()
 
     def last_downtime_ended(self):
         """
@@ -566,22 +643,28 @@ class Netbox(models.Model):
         base = metric_prefix_for_device(self.sysname)
 
         nodes = get_all_leaves_below(base, [ports_exclude, sensors_exclude])
+        prefix_len = len(base) + 1
         result = []
         for node in nodes:
-            suffix = node.replace(base + '.', '')
-            elements = suffix.split('.')
-            group = elements[0]
-            suffix = '.'.join(elements[1:])
+            group, _, suffix = node[prefix_len:].partition('.')
             result.append(dict(id=node, group=group, suffix=suffix))
 
         return result
 
     def has_unignored_unrecognized_neighbors(self):
         """Returns true if this netbox has unignored unrecognized neighbors"""
-        return self.unrecognized_neighbors.filter(ignored_since=None).count() > 0
+        return self.unrecognized_neighbors.filter(ignored_since=None).exists()
 
     def get_chassis(self):
-        """Returns a QuerySet of chassis devices seen on this netbox"""
+        """Returns a QuerySet of chassis devices seen on this netbox.
+
+        If the chassis entities were prefetched using
+        NetboxQuerySet.with_chassis(), a list of these is returned instead.
+        """
+        try:
+            return self._chassis_entities
+        except AttributeError:
+            pass
         return self.entities.filter(
             device__isnull=False,
             physical_class=NetboxEntity.CLASS_CHASSIS,
@@ -595,13 +678,14 @@ class Netbox(models.Model):
         )
 
     @property
-    def mac_addresses(self) -> Set[str]:
+    def mac_addresses(self) -> FrozenSet[str]:
         """Returns a set of collected chassis MAC addresses for this Netbox"""
-        macinfo_match = (Q(key="bridge_info") & Q(variable="base_address")) | (
-            Q(key="lldp") & Q(variable="chassis_mac")
-        )
-        macs = self.info_set.filter(macinfo_match).distinct("value").only("value")
-        return set(mac.value for mac in macs)
+        try:
+            return frozenset(self._mac_addresses)
+        except AttributeError:
+            pass
+        macs = self.info_set.filter(_MAC_INFO_Q).values_list("value", flat=True)
+        return frozenset(macs.distinct())
 
 
 class NetboxInfo(models.Model):
@@ -629,11 +713,39 @@ class NetboxInfo(models.Model):
     @classmethod
     def cache_set(cls, netbox, key, variable, value):
         """Attempts to cache a serialized Python value as a NetboxInfo record"""
-        cache, _ = cls.objects.get_or_create(
-            netbox_id=netbox.id, key=key, variable=variable
+        cls.cache_set_many(netbox, [(key, variable, value)])
+
+    @classmethod
+    @transaction.atomic
+    def cache_set_many(cls, netbox, items):
+        """Attempts to cache multiple serialized Python values as NetboxInfo
+        records, using a fixed number of queries regardless of the number of
+        values.
+
+        :param items: An iterable of (key, variable, value) tuples.
+        """
+        values = {
+            (key, variable): base64.b64encode(pickle.dumps(value)).decode("ascii")
+            for key, variable, value in items
+        }
+        if not values:
+            return
+
+        match = Q()
+        for key, variable in values:
+            match |= Q(key=key, variable=variable)
+
+        existing = []
+        for info in cls.objects.filter(match, netbox_id=netbox.id):
+            value = values.pop((info.key, info.variable), None)
+            if value is not None:
+                info.value = value
+                existing.append(info)
+        cls.objects.bulk_update(existing, ['value'])
+        cls.objects.bulk_create(
+            cls(netbox_id=netbox.id, key=key, variable=variable, value=value)
+            for (key, variable), value in values.items()
         )
-        cache.value = base64.encodebytes(pickle.dumps(value))
-        cache.save()
 
     @classmethod
     def cache_get(cls, netbox, key, variable):
@@ -641,13 +753,17 @@ class NetboxInfo(models.Model):
         record. Returns None if unsucessful for any reason.
         """
         try:
-            cache = cls.objects.get(netbox_id=netbox.id, key=key, variable=variable)
+            value = (
+                cls.objects.filter(netbox_id=netbox.id, key=key, variable=variable)
+                .values_list('value', flat=True)
+                .get()
+            )
         except cls.DoesNotExist:
             return None
         try:
-            value = cache.value.encode("utf-8")
-            remote_table = pickle.loads(base64.decodebytes(value))
-            return remote_table
+            # b64decode() discards the line breaks found in values stored by
+            # older versions of NAV
+            return pickle.loads(base64.b64decode(value))
         except Exception as error:
             _logger.debug(
                 "Unable to unpickle cache value for (%r, %r, %r): %s",
@@ -660,6 +776,10 @@ class NetboxInfo(models.Model):
             return None
 
 
+# Matches the model names of Cisco supervisor modules
+_SUPERVISOR_PATTERN = re.compile(r'(?i:supervisor)|\bSup\b|WS-SUP')
+
+
 class NetboxEntity(models.Model):
     """
     Represents a physical Entity within a Netbox. Largely modeled after
@@ -788,37 +908,54 @@ class NetboxEntity(models.Model):
         this entity as a parent. Returns the software version of the first one
         in that list.
         """
-        supervisor_patterns = [
-            re.compile(r'supervisor', re.I),
-            re.compile('\bSup\b'),
-            re.compile(r'WS-SUP'),
-        ]
-
-        sup_candidates = []
         modules = NetboxEntity.objects.filter(
             physical_class=NetboxEntity.CLASS_MODULE, netbox=self.netbox
         )
+        sup_candidates = [
+            module
+            for module in modules
+            if module.model_name and _SUPERVISOR_PATTERN.search(module.model_name)
+        ]
 
-        for pattern in supervisor_patterns:
-            for module in modules:
-                if pattern.search(module.model_name):
-                    sup_candidates.append(module)
+        if not sup_candidates:
+            return
 
+        parent_map = self._get_parent_map()
         for sup in sup_candidates:
-            parents = sup.get_parents()
-            if self in parents and sup.software_revision:
+            if sup.software_revision and self.id in sup._get_parent_ids(parent_map):
                 return sup.software_revision
 
     def get_parents(self):
-        """Gets the parents of this entity
+        """Gets the parents of this entity, starting with the closest one
 
         :rtype: list<NetboxEntity>
         """
-        parents = []
-        if self.contained_in:
-            parents.append(self.contained_in)
-            parents += self.contained_in.get_parents()
-        return parents
+        if not self.contained_in_id:
+            return []
+        parent_ids = self._get_parent_ids(self._get_parent_map())
+        parents = NetboxEntity.objects.in_bulk(parent_ids)
+        return [parents[pk] for pk in parent_ids if pk in parents]
+
+    def _get_parent_map(self):
+        """Returns a dict mapping the id of every entity of this entity's netbox
+        to the id of the entity it is contained in.
+        """
+        return dict(
+            NetboxEntity.objects.filter(netbox_id=self.netbox_id).values_list(
+                'id', 'contained_in_id'
+            )
+        )
+
+    def _get_parent_ids(self, parent_map):
+        """Returns the ids of the parents of this entity, starting with the
+        closest one, as found by walking parent_map.
+        """
+        parent_ids = []
+        parent_id = self.contained_in_id
+        while parent_id and parent_id not in parent_ids:
+            parent_ids.append(parent_id)
+            parent_id = parent_map.get(parent_id)
+        return parent_ids
 
 
 class NetboxPrefix(models.Model):
@@ -906,6 +1043,18 @@ class Device(models.Model):
         return str(self)
 
 
+class ModuleQuerySet(models.QuerySet):
+    def with_maintenance_state(self):
+        """Annotates every Module with whether its netbox is on maintenance, so
+        that Module.is_on_maintenace() doesn't need to query the database for
+        each object.
+        """
+        maintenance = nav.models.event.AlertHistory.objects.unresolved(
+            'maintenanceState'
+        ).filter(variables__variable='netbox', netbox=OuterRef('netbox'))
+        return self.annotate(_on_maintenance=Exists(maintenance))
+
+
 class Module(models.Model):
     """From NAV Wiki: The module table defines modules. A module is a part of a
     netbox of category GW, SW and GSW. A module has ports; i.e router ports
@@ -939,6 +1088,8 @@ class Module(models.Model):
     up = models.CharField(max_length=1, choices=UP_CHOICES, default=UP_UP)
     down_since = models.DateTimeField(db_column='downsince')
 
+    objects = ModuleQuerySet.as_manager()
+
     class Meta(object):
         db_table = 'module'
         verbose_name = 'module'
@@ -959,9 +1110,17 @@ class Module(models.Model):
 
     def get_gwports(self):
         """Returns all interfaces that have IP addresses."""
-        return Interface.objects.filter(
-            module=self, gwport_prefixes__isnull=False
-        ).distinct()
+        return (
+            Interface.objects.filter(module=self, gwport_prefixes__isnull=False)
+            .distinct()
+            .select_related('module', 'netbox')
+            .prefetch_related(
+                Prefetch(
+                    'gwport_prefixes',
+                    queryset=GwPortPrefix.objects.select_related('prefix'),
+                )
+            )
+        )
 
     def get_gwports_sorted(self):
         """Returns gwports naturally sorted by interface name"""
@@ -971,9 +1130,9 @@ class Module(models.Model):
 
     def get_swports(self):
         """Returns all interfaces that are switch ports."""
-        return Interface.objects.select_related().filter(
+        return Interface.objects.filter(
             module=self, baseport__isnull=False
-        )
+        ).select_related('module', 'netbox')
 
     def get_swports_sorted(self):
         """Returns swports naturally sorted by interface name"""
@@ -983,7 +1142,11 @@ class Module(models.Model):
 
     def get_physical_ports(self):
         """Return all ports that are present."""
-        return Interface.objects.filter(module=self, ifconnectorpresent=True).distinct()
+        return (
+            Interface.objects.filter(module=self, ifconnectorpresent=True)
+            .distinct()
+            .select_related('module', 'netbox')
+        )
 
     def get_physical_ports_sorted(self):
         """Return all ports that are present sorted by interface name."""
@@ -992,7 +1155,10 @@ class Module(models.Model):
 
     def is_on_maintenace(self):
         """Returns True if the owning Netbox is on maintenance"""
-        return self.netbox.is_on_maintenance()
+        try:
+            return self._on_maintenance
+        except AttributeError:
+            return self.netbox.is_on_maintenance()
 
     def get_entity(self):
         """
@@ -1000,37 +1166,66 @@ class Module(models.Model):
 
         :returns: Either a NetboxEntity object or None.
         """
-        entities = NetboxEntity.objects.filter(netbox=self.netbox, device=self.device)
-        if entities:
-            if len(entities) > 1:
-                _logger.info(
-                    "Module.get_entity(): %s weirdly appears to have "
-                    "duplicate entities, returning just one",
-                    self,
-                )
-            return entities[0]
+        key = (self.netbox_id, self.device_id)
+        try:
+            cached_key, entity = self._cached_entity
+            if cached_key == key:
+                return entity
+        except AttributeError:
+            pass
+
+        entity = self._fetch_entity()
+        self._cached_entity = (key, entity)
+        return entity
+
+    def _fetch_entity(self):
+        entities = NetboxEntity.objects.filter(
+            netbox_id=self.netbox_id, device_id=self.device_id
+        )
+        entity = entities.first()
+        if entity and settings.DEBUG and entities.exclude(pk=entity.pk).exists():
+            _logger.info(
+                "Module.get_entity(): %s weirdly appears to have "
+                "duplicate entities, returning just one",
+                self,
+            )
+        return entity
 
     def get_chassis(self):
         """
         Attempts to find the NetboxEntity that corresponds to the chassis that
         contains this module.
 
-        :return:
+        :return: Either a NetboxEntity object or None.
         """
-        me = self.get_entity()
-        if not me:
-            return
-
-        entities = {e.id: e for e in NetboxEntity.objects.filter(netbox=self.netbox)}
-        visited = set()
-        current = entities.get(me.id)
-        while current is not None and not current.is_chassis():
-            visited.add(current)
-            current = entities.get(current.contained_in_id)
-            if current in visited:
-                # there's a loop here, exit now
-                return
-        return current
+        chassis = NetboxEntity.objects.raw(
+            self._chassis_sql,
+            [
+                self.netbox_id,
+                self.device_id,
+                NetboxEntity.CLASS_CHASSIS,
+                NetboxEntity.CLASS_CHASSIS,
+            ],
+        )
+        for entity in chassis:
+            return entity
+
+    # Walks up the containment chain from this module's entity, stopping at the
+    # first chassis entity. Only the rows of the chain are visited.
+    _chassis_sql = (
+        "WITH RECURSIVE chain AS ("
+        "(SELECT netboxentity.*, ARRAY[netboxentityid] AS chain_path "
+        "FROM netboxentity WHERE netboxid = %s AND deviceid = %s "
+        "ORDER BY netboxentityid LIMIT 1) "
+        "UNION ALL "
+        "SELECT parent.*, chain.chain_path || parent.netboxentityid "
+        "FROM netboxentity parent "
+        "JOIN chain ON (parent.netboxentityid = chain.contained_in_id) "
+        "WHERE chain.physical_class IS DISTINCT FROM %s "
+        "AND NOT parent.netboxentityid = ANY(chain.chain_path)"
+        ") "
+        "SELECT * FROM chain WHERE physical_class = %s"
+    )
 
 
 class Memory(models.Model):
@@ -1060,6 +1255,16 @@ class Memory(models.Model):
             return self.type
 
 
+class ListViewManager(models.Manager):
+    """Manager for models with a free-form data attribute"""
+
+    def list_view(self):
+        """Returns all objects, but defers loading their data attribute, which
+        is rarely needed when listing many objects.
+        """
+        return self.get_queryset().defer('data')
+
+
 class Room(models.Model):
     """From NAV Wiki: The room table defines a wiring closes / network room /
     server room."""
@@ -1075,6 +1280,8 @@ class Room(models.Model):
     position = PointField(null=True, blank=True, default=None)
     data = HStoreField(blank=True, default=dict)
 
+    objects = ListViewManager()
+
     class Meta(object):
         db_table = 'room'
         verbose_name = 'room'
@@ -1105,9 +1312,37 @@ class TreeMixin(object):
 
     def num_ancestors(self):
         """The number of ancestors, how deep am I?"""
-        if self.parent:
-            return 1 + self.parent.num_ancestors()
-        return 0
+        if self.parent_id is None:
+            return 0
+        try:
+            parent_id, num_ancestors = self._cached_num_ancestors
+            if parent_id == self.parent_id:
+                return num_ancestors
+        except AttributeError:
+            pass
+
+        num_ancestors = self._count_ancestors()
+        self._cached_num_ancestors = (self.parent_id, num_ancestors)
+        return num_ancestors
+
+    def _count_ancestors(self):
+        table = self._meta.db_table
+        pk = self._meta.pk.column
+        parent = self._meta.get_field('parent').column
+        sql = (
+            "WITH RECURSIVE ancestors AS ("
+            "SELECT {pk}, {parent}, ARRAY[{pk}] AS tree_path FROM {table} "
+            "WHERE {pk} = %s "
+            "UNION ALL "
+            "SELECT p.{pk}, p.{parent}, a.tree_path || p.{pk} "
+            "FROM {table} p JOIN ancestors a ON (p.{pk} = a.{parent}) "
+            "WHERE NOT p.{pk} = ANY(a.tree_path)"
+            ") "
+            "SELECT count(*) FROM ancestors"
+        ).format(table=table, pk=pk, parent=parent)
+        with connection.cursor() as cursor:
+            cursor.execute(sql, [self.parent_id])
+            return cursor.fetchone()[0]
 
     def has_children(self):
         """Returns true if this instance has children"""
@@ -1118,13 +1353,35 @@ class TreeMixin(object):
         return self.__class__.objects.filter(parent=self)
 
     def get_descendants(self, include_self=False):
-        """Gets all descendants of this instance"""
-        descendants = []
-        if include_self:
-            descendants.append(self)
-        for child in self.get_children():
-            descendants.extend(child.get_descendants(include_self=True))
-        return descendants
+        """Gets all descendants of this instance, depth first"""
+        sql = self._descendants_sql("*", include_self)
+        return list(self.__class__.objects.raw(sql, [self.pk]))
+
+    @classmethod
+    def _descendants_sql(cls, columns, include_self):
+        """Returns a recursive SQL query that selects the given columns from all
+        the descendants of the row whose primary key is given as a parameter.
+        """
+        table = cls._meta.db_table
+        pk = cls._meta.pk.column
+        parent = cls._meta.get_field('parent').column
+        return (
+            "WITH RECURSIVE tree AS ("
+            "SELECT {table}.*, ARRAY[{pk}] AS tree_path FROM {table} "
+            "WHERE {pk} = %s "
+            "UNION ALL "
+            "SELECT child.*, tree.tree_path || child.{pk} "
+            "FROM {table} child JOIN tree ON (child.{parent} = tree.{pk}) "
+            "WHERE NOT child.{pk} = ANY(tree.tree_path)"
+            ") "
+            "SELECT {columns} FROM tree {where}ORDER BY tree_path"
+        ).format(
+            table=table,
+            pk=pk,
+            parent=parent,
+            columns=columns,
+            where="" if include_self else "WHERE array_length(tree_path, 1) > 1 ",
+        )
 
 
 class Location(models.Model, TreeMixin):
@@ -1142,6 +1399,8 @@ class Location(models.Model, TreeMixin):
     description = VarcharField(db_column='descr', blank=True)
     data = HStoreField(default=dict)
 
+    objects = ListViewManager()
+
     class Meta(object):
         db_table = 'location'
         verbose_name = 'location'
@@ -1156,7 +1415,7 @@ class Location(models.Model, TreeMixin):
     def get_all_rooms(self):
         """Return a queryset returning all rooms in this location and
         sublocations"""
-        locations = self.get_descendants(True)
+        locations = RawSQL(self._descendants_sql(self._meta.pk.column, True), [self.pk])
         return Room.objects.filter(location__in=locations)
 
 
@@ -1177,6 +1436,8 @@ class Organization(models.Model, TreeMixin):
     contact = VarcharField(db_column='contact', blank=True)
     data = HStoreField(default=dict)
 
+    objects = ListViewManager()
+
     class Meta(object):
         db_table = 'org'
         verbose_name = 'organization'
@@ -1190,8 +1451,7 @@ class Organization(models.Model, TreeMixin):
 
     def extract_emails(self):
         """Naively extract email addresses from the contact string"""
-        contact = self.contact if self.contact else ""
-        return re.findall(r'(\b[\w.]+@[\w.]+\b)', contact)
+        return _EMAIL_PATTERN.findall(self.contact or "")
 
 
 class Category(models.Model):
@@ -1368,6 +1628,13 @@ class GwPortPrefix(models.Model):
         return self.gw_ip
 
 
+class Masklen(Func):
+    """The netmask length of a CIDR value"""
+
+    function = 'masklen'
+    output_field = models.IntegerField()
+
+
 class PrefixManager(models.Manager):
     def contains_ip(self, ipaddr):
         """Gets all prefixes that contain the given IP address,
@@ -1377,12 +1644,9 @@ class PrefixManager(models.Manager):
         return (
             self.get_queryset()
             .exclude(vlan__net_type="loopback")
-            .extra(
-                select={'mlen': 'masklen(netaddr)'},
-                where=["%s <<= netaddr"],
-                params=[ipaddr],
-                order_by=["-mlen"],
-            )
+            .filter(net_address__net_contains_or_equals=ipaddr)
+            .annotate(mlen=Masklen('net_address'))
+            .order_by(Masklen('net_address').desc())
             .select_related('vlan')
         )
 
@@ -1532,32 +1796,36 @@ class Vlan(models.Model):
 
     def get_graph_urls(self):
         """Fetches the graph urls for graphing this vlan"""
-        return [url for url in [self.get_graph_url(f) for f in [4, 6]] if url]
+        addresses = list(self.prefixes.values_list('net_address', flat=True))
+        urls = [
+            self._build_graph_url(
+                [addr for addr in addresses if IPy.IP(addr).version() == family],
+                family,
+            )
+            for family in (4, 6)
+        ]
+        return [url for url in urls if url]
 
     def get_graph_url(self, family=4):
         """Creates a graph url for the given family with all prefixes stacked"""
         assert family in [4, 6]
         prefixes = self.prefixes.extra(where=["family(netaddr)=%s" % family])
+        addresses = list(prefixes.values_list('net_address', flat=True))
+        return self._build_graph_url(addresses, family)
+
+    def _build_graph_url(self, addresses, family):
         # Put metainformation in the alias so that Rickshaw can pick it up and
         # know how to draw the series.
-        series = [
-            "alias({}, 'renderer=area;;{}')".format(
-                metric_path_for_prefix(prefix.net_address, 'ip_count'),
-                prefix.net_address,
-            )
-            for prefix in prefixes
-        ]
+        counts = (
+            (addr, metric_path_for_prefix(addr, 'ip_count')) for addr in addresses
+        )
+        series = [f"alias({path}, 'renderer=area;;{addr}')" for addr, path in counts]
         if series:
             if family == 4:
-                series.append(
-                    "alias(sumSeries(%s), 'Max addresses')"
-                    % ",".join(
-                        [
-                            metric_path_for_prefix(prefix.net_address, 'ip_range')
-                            for prefix in prefixes
-                        ]
-                    )
+                ranges = ",".join(
+                    metric_path_for_prefix(addr, 'ip_range') for addr in addresses
                 )
+                series.append(f"alias(sumSeries({ranges}), 'Max addresses')")
             return get_simple_graph_url(
                 series,
                 title="Total IPv{} addresses on vlan {} - stacked".format(
@@ -1691,6 +1959,28 @@ class SwPortVlan(models.Model):
         return u'%s, on vlan %s' % (self.interface, self.vlan)
 
 
+# The set bit numbers of every possible octet value, counting from the most
+# significant bit, as used by the SwPortAllowedVlan hexstrings
+_SET_BITS_IN_OCTET = tuple(
+    tuple(bit for bit in range(8) if octet & (0x80 >> bit)) for octet in range(256)
+)
+
+
+@lru_cache(maxsize=1024)
+def _decode_allowed_vlans(hex_string):
+    """Decodes an allowed VLAN hexstring into a frozenset of VLAN numbers.
+
+    Many trunk ports share the same allowed VLAN configuration, so results are
+    cached by hexstring.
+    """
+    vlans = set()
+    for index, octet in enumerate(bytes.fromhex(hex_string)):
+        if octet:
+            offset = index * 8
+            vlans.update(offset + bit for bit in _SET_BITS_IN_OCTET[octet])
+    return frozenset(vlans)
+
+
 class SwPortAllowedVlan(models.Model):
     """Stores a hexstring that encodes the list of VLANs that are allowed to
     traverse a trunk port.
@@ -1705,8 +1995,6 @@ class SwPortAllowedVlan(models.Model):
         related_name="swport_allowed_vlan",
     )
     hex_string = VarcharField(db_column='hexstring')
-    _cached_hex_string = ''
-    _cached_vlan_set = None
 
     class Meta(object):
         db_table = 'swportallowedvlan'
@@ -1719,13 +2007,11 @@ class SwPortAllowedVlan(models.Model):
         """Converts the plaintext formatted hex_string attribute to a list of
         VLAN numbers.
 
-        :returns: A set of integers.
+        :returns: A frozenset of integers.
         """
-        if self._cached_hex_string != self.hex_string:
-            self._cached_hex_string = self.hex_string
-            self._cached_vlan_set = self._calculate_allowed_vlans()
-
-        return self._cached_vlan_set or set()
+        if not self.hex_string:
+            return frozenset()
+        return _decode_allowed_vlans(self.hex_string)
 
     @staticmethod
     def vlan_list_to_hex(vlans):
@@ -1734,19 +2020,32 @@ class SwPortAllowedVlan(models.Model):
         # resulting hex string.  This is necessary for parts of NAV to
         # parse the hexstring correctly.
         max_vlan = max(vlans)
-        needed_octets = int(math.ceil((max_vlan + 1) / 8.0))
-        bits = BitVector(b'\x00' * max(needed_octets, 128))
+        needed_octets = (max_vlan + 8) // 8
+        octets = bytearray(max(needed_octets, 128))
         for vlan in vlans:
-            bits[vlan] = True
-        return bits.to_hex()
+            octets[vlan >> 3] |= 0x80 >> (vlan & 7)
+        return octets.hex()
+
+    @classmethod
+    def bulk_decode(cls, netbox_id):
+        """Fetches and decodes the allowed VLANs of every trunk port on a
+        netbox, using a single database query.
+
+        :returns: A dict mapping interface ids to frozensets of VLAN numbers.
+        """
+        rows = cls.objects.filter(interface__netbox_id=netbox_id).values_list(
+            'interface_id', 'hex_string'
+        )
+        return {
+            interface_id: _decode_allowed_vlans(hex_string)
+            if hex_string
+            else frozenset()
+            for interface_id, hex_string in rows
+        }
 
     def set_allowed_vlans(self, vlans):
         self.hex_string = self.vlan_list_to_hex(vlans)
 
-    def _calculate_allowed_vlans(self):
-        bits = BitVector(bytes.fromhex(self.hex_string))
-        return set(bits.get_set_bits())
-
     def __str__(self):
         return u'Allowed vlans for swport %s' % self.interface
 
@@ -1886,6 +2185,43 @@ class Cam(models.Model):
 ### Interfaces and related attributes
 
 
+def _find_ranges(numbers):
+    """Yields (first, last) tuples describing the consecutive runs of numbers
+    in an iterable of integers.
+    """
+    numbers = iter(sorted(numbers))
+    first = last = next(numbers, None)
+    if first is None:
+        return
+    for number in numbers:
+        if number != last + 1:
+            yield first, last
+            first = number
+        last = number
+    yield first, last
+
+
+def _swport_vlan_number(swport_vlan):
+    # Mirrors ORDER BY vlan__vlan, where NULLs sort last
+    number = swport_vlan.vlan.vlan
+    return (number is None, number or 0)
+
+
+class InterfaceQuerySet(models.QuerySet):
+    def with_related(self):
+        """Fetches the relations that are commonly displayed when listing
+        interfaces, so they don't need to be looked up for each object.
+        """
+        return self.select_related(
+            'netbox', 'module', 'to_netbox', 'to_interface'
+        ).prefetch_related(
+            'swport_vlans__vlan',
+            'swport_allowed_vlan',
+            'unrecognized_neighbors',
+            'gwport_prefixes',
+        )
+
+
 class Interface(models.Model):
     """The network interfaces, both physical and virtual, of a Netbox."""
 
@@ -1906,6 +2242,7 @@ class Interface(models.Model):
         (OPER_NOTPRESENT, 'not present'),
         (OPER_LOWERLAYERDOWN, 'lower layer down'),
     )
+    _OPER_STATUS_DISPLAY = dict(OPER_STATUS_CHOICES)
 
     ADM_UP = 1
     ADM_DOWN = 2
@@ -1916,6 +2253,7 @@ class Interface(models.Model):
         (ADM_DOWN, 'down'),
         (ADM_TESTING, 'testing'),
     )
+    _ADM_STATUS_DISPLAY = dict(ADM_STATUS_CHOICES)
 
     DUPLEX_FULL = 'f'
     DUPLEX_HALF = 'h'
@@ -1984,29 +2322,47 @@ class Interface(models.Model):
 
     gone_since = models.DateTimeField()
 
+    objects = InterfaceQuerySet.as_manager()
+
     class Meta(object):
         db_table = u'interface'
         ordering = ('baseport', 'ifname')
 
-    def __init__(self, *args, **kwargs):
-        super(Interface, self).__init__(*args, **kwargs)
-        # Create cache dictionary
-        # FIXME: Replace with real Django caching
-        self.time_since_activity_cache = {}
-
     def __str__(self):
-        return u'{ifname} at {netbox}'.format(ifname=self.ifname, netbox=self.netbox)
+        return u'{ifname} at {netbox}'.format(
+            ifname=self.ifname, netbox=self._get_short_sysname()
+        )
 
     @property
     def audit_logname(self):
         template = u'{netbox}:{ifname}'
-        return template.format(
-            ifname=self.ifname, netbox=self.netbox.get_short_sysname()
-        )
+        return template.format(ifname=self.ifname, netbox=self._get_short_sysname())
+
+    def _get_short_sysname(self):
+        """Returns the short sysname of the owning Netbox, without loading the
+        full Netbox object if it hasn't been loaded already.
+        """
+        if Interface.netbox.is_cached(self):
+            return self.netbox.get_short_sysname()
+        cached = getattr(self, '_cached_short_sysname', None)
+        if cached and cached[0] == self.netbox_id:
+            return cached[1]
+        sysname, ip = Netbox.objects.values_list('sysname', 'ip').get(id=self.netbox_id)
+        short = _shorten_sysname(sysname, ip)
+        self._cached_short_sysname = (self.netbox_id, short)
+        return short
 
     @classmethod
     def sort_ports_by_ifname(cls, ports):
-        return sorted(ports, key=lambda p: nav.natsort.split(p.ifname))
+        return sorted(ports, key=lambda p: nav.natsort.sort_key(p.ifname))
+
+    # Django's get_FOO_display() builds a dict of the field's choices on every
+    # call; these are used often enough in port listings to warrant a shortcut
+    def get_ifoperstatus_display(self):
+        return self._OPER_STATUS_DISPLAY.get(self.ifoperstatus, self.ifoperstatus)
+
+    def get_ifadminstatus_display(self):
+        return self._ADM_STATUS_DISPLAY.get(self.ifadminstatus, self.ifadminstatus)
 
     def get_absolute_url(self):
         kwargs = {
@@ -2015,14 +2371,19 @@ class Interface(models.Model):
         }
         return reverse('ipdevinfo-interface-details', kwargs=kwargs)
 
+    def _is_prefetched(self, name):
+        return name in getattr(self, '_prefetched_objects_cache', {})
+
     def get_vlan_numbers(self):
         """List of VLAN numbers related to the port"""
 
-        # XXX: This causes a DB query per port
-        vlans = [
-            swpv.vlan.vlan
-            for swpv in self.swport_vlans.select_related('vlan', 'interface')
-        ]
+        if self._is_prefetched('swport_vlans'):
+            vlans = [swport_vlan.vlan.vlan for swport_vlan in self.swport_vlans.all()]
+        else:
+            # XXX: This causes a DB query per port
+            vlans = list(
+                self.swport_vlans.order_by().values_list('vlan__vlan', flat=True)
+            )
         if self.vlan is not None and self.vlan not in vlans:
             vlans.append(self.vlan)
         vlans.sort()
@@ -2056,33 +2417,38 @@ class Interface(models.Model):
         activity as a datetime.timedelta object.
         """
 
-        # Check cache for result
-        if interval in self.time_since_activity_cache:
-            return self.time_since_activity_cache[interval]
-
-        min_time = dt.datetime.now() - dt.timedelta(days=interval)
+        # Check cache for result. It is created on first use, as most
+        # Interface objects never have this method called.
         try:
-            # XXX: This causes a DB query per port
-            # Use .values() to avoid creating additional objects we do not need
-            last_cam_entry_end_time = (
-                self.netbox.cam_set.filter(ifindex=self.ifindex, end_time__gt=min_time)
-                .order_by('-end_time')
-                .values('end_time')[0]['end_time']
+            activity = self._time_since_activity_cache
+        except AttributeError:
+            activity = self._time_since_activity_cache = {}
+        if interval in activity:
+            return activity[interval]
+
+        now = dt.datetime.now()
+        min_time = now - dt.timedelta(days=interval)
+        # XXX: This causes a DB query per port
+        last_cam_entry_end_time = (
+            Cam.objects.filter(
+                netbox_id=self.netbox_id, ifindex=self.ifindex, end_time__gt=min_time
             )
-        except (Cam.DoesNotExist, IndexError):
-            # Inactive/not in use
-            return None
+            .order_by('-end_time')
+            .values_list('end_time', flat=True)
+            .first()
+        )
 
-        if last_cam_entry_end_time == dt.datetime.max:
+        if last_cam_entry_end_time is None:
+            # Inactive/not in use
+            activity[interval] = None
+        elif last_cam_entry_end_time == dt.datetime.max:
             # Active now
-            self.time_since_activity_cache[interval] = dt.timedelta(days=0)
+            activity[interval] = dt.timedelta(days=0)
         else:
             # Active some time inside the given interval
-            self.time_since_activity_cache[interval] = (
-                dt.datetime.now() - last_cam_entry_end_time
-            )
+            activity[interval] = now - last_cam_entry_end_time
 
-        return self.time_since_activity_cache[interval]
+        return activity[interval]
 
     def get_port_metrics(self):
         """Gets a list of available Graphite metrics related to this Interface.
@@ -2094,7 +2460,11 @@ class Interface(models.Model):
         """
         base = metric_prefix_for_interface(self.netbox, self.ifname)
 
-        nodes = get_all_leaves_below(base)
+        cache_key = 'port_metrics:' + base
+        nodes = cache.get(cache_key)
+        if nodes is None:
+            nodes = get_all_leaves_below(base)
+            cache.set(cache_key, nodes, timeout=PORT_METRICS_CACHE_TIMEOUT)
         result = [
             dict(
                 id=n,
@@ -2119,19 +2489,11 @@ class Interface(models.Model):
         Ex: [1, 2, 3, 4, 7, 8, 10] -> "1-4,7-8,10"
         """
 
-        def as_range(iterable):
-            list_ = list(iterable)
-            if len(list_) > 1:
-                return '{0}-{1}'.format(list_[0], list_[-1])
-            else:
-                return '{0}'.format(list_[0])
-
         if self.trunk:
             return ",".join(
-                as_range(y)
-                for x, y in groupby(
-                    sorted(self.swport_allowed_vlan.get_allowed_vlans()),
-                    lambda n, c=count(): n - next(c),
+                str(first) if first == last else '{0}-{1}'.format(first, last)
+                for first, last in _find_ranges(
+                    self.swport_allowed_vlan.get_allowed_vlans()
                 )
             )
         else:
@@ -2148,7 +2510,9 @@ class Interface(models.Model):
         other hosts.
 
         """
-        return self.gwport_prefixes.count() > 0
+        if self._is_prefetched('gwport_prefixes'):
+            return bool(self.gwport_prefixes.all())
+        return self.gwport_prefixes.exists()
 
     def is_physical_port(self):
         """Returns true if this interface has a physical connector present"""
@@ -2183,6 +2547,17 @@ class Interface(models.Model):
             .first()
         )
 
+    def get_aggregator_id(self):
+        """Returns the id of the interface that get_aggregator() would return,
+        or None if this interface isn't aggregated.
+        """
+        return (
+            Interface.objects.filter(aggregators__interface=self)
+            .order_by('ifindex')
+            .values_list('id', flat=True)
+            .first()
+        )
+
     def get_bundled_interfaces(self):
         """Returns the interfaces that are bundled on this interface"""
         return Interface.objects.filter(bundled__aggregator=self)
@@ -2193,11 +2568,17 @@ class Interface(models.Model):
         not, None if this interface is not a known aggregator.
         """
         aggregates = self.get_bundled_interfaces()
-        if aggregates:
-            return any(not agg.is_oper_up() for agg in aggregates)
+        if aggregates.exists():
+            return aggregates.exclude(ifoperstatus=self.OPER_UP).exists()
 
     def get_sorted_vlans(self):
-        """Returns a queryset of sorted swportvlans"""
+        """Returns the swportvlans of this interface, sorted by vlan number.
+
+        If the swportvlans have been prefetched, they are sorted in Python and
+        returned as a list, otherwise a sorted queryset is returned.
+        """
+        if self._is_prefetched('swport_vlans'):
+            return sorted(self.swport_vlans.all(), key=_swport_vlan_number)
         return self.swport_vlans.select_related('vlan').order_by('vlan__vlan')
 
     def is_on_maintenace(self):
@@ -2208,9 +2589,12 @@ class Interface(models.Model):
         """Returns True if this interface has unrecognized neighbors that are
         not ignored
         """
-        return (
-            self.unrecognized_neighbors.filter(ignored_since__isnull=True).count() > 0
-        )
+        if self._is_prefetched('unrecognized_neighbors'):
+            return any(
+                neighbor.ignored_since is None
+                for neighbor in self.unrecognized_neighbors.all()
+            )
+        return self.unrecognized_neighbors.filter(ignored_since__isnull=True).exists()
 
 
 class InterfaceStack(models.Model):
@@ -2314,13 +2698,20 @@ class GatewayPeerSession(models.Model):
     def get_peer_as_netbox(self):
         """If the peer of this partner is a known Netbox, it is returned.
 
+        The result is stored in this object for later use, for as long as the
+        peer attribute stays the same.
+
         :rtype: Netbox
 
         """
+        cached = getattr(self, '_cached_peer_netbox', None)
+        if cached and cached[0] == self.peer:
+            return cached[1]
+
         expr = Q(ip=self.peer) | Q(interfaces__gwport_prefixes__gw_ip=self.peer)
-        netboxes = Netbox.objects.filter(expr)
-        if netboxes:
-            return netboxes[0]
+        netbox = Netbox.objects.filter(expr).first()
+        self._cached_peer_netbox = (self.peer, netbox)
+        return netbox
 
     def get_peer_display(self):
         """Returns a display name for the peer.
@@ -2431,6 +2822,7 @@ class Sensor(models.Model):
         (UNIT_SECONDS, 'Seconds'),
         (UNIT_MINUTES, 'Minutes'),
     )
+    _UNIT_OF_MEASUREMENTS_DISPLAY = dict(UNIT_OF_MEASUREMENTS_CHOICES)
 
     SCALE_YOCTO = 'yocto'  # 10^-24
     SCALE_ZEPTO = 'zepto'  # 10^-21
@@ -2469,6 +2861,11 @@ class Sensor(models.Model):
         (SCALE_ZETTA, 'Zetta'),
         (SCALE_YOTTA, 'Yotta'),
     )
+    _DATA_SCALE_DISPLAY = dict(DATA_SCALE_CHOICES)
+
+    # Default display maximums for units where 100 makes a poor default
+    _DISPLAY_MAXIMUM_DEFAULTS = {UNIT_CELSIUS: 50}
+
     ALERT_TYPE_WARNING = 1
     ALERT_TYPE_ALERT = 2
     ALERT_TYPE_CHOICES = (
@@ -2532,6 +2929,16 @@ class Sensor(models.Model):
     def get_absolute_url(self):
         return reverse('sensor-details', kwargs={'identifier': self.pk})
 
+    # Overrides Django's get_FOO_display(), the graph building code calls these
+    # for many sensors
+    def get_unit_of_measurement_display(self):
+        return self._UNIT_OF_MEASUREMENTS_DISPLAY.get(
+            self.unit_of_measurement, self.unit_of_measurement
+        )
+
+    def get_data_scale_display(self):
+        return self._DATA_SCALE_DISPLAY.get(self.data_scale, self.data_scale)
+
     def get_metric_name(self):
         return metric_path_for_sensor(self.netbox.sysname, self.internal_name)
 
@@ -2545,15 +2952,7 @@ class Sensor(models.Model):
         :param format: The format of the desired graph, e.g. `png` or `json`
         :rtype: Graph
         """
-        alias = (
-            self.human_readable.replace("\n", " ") if self.human_readable else self.name
-        )
-        # turns out graphite-web cannot handle non-ascii characters in
-        # aliases. we replace them here so we at least get a graph.
-        #
-        # https://github.com/graphite-project/graphite-web/issues/238
-        # https://github.com/graphite-project/graphite-web/pull/480
-        alias = alias.encode("ascii", errors="replace").decode("ascii")
+        alias = self._get_graph_alias()
 
         scale = (
             self.get_data_scale_display()
@@ -2572,20 +2971,30 @@ class Sensor(models.Model):
 
         return Graph(targets=[target], format=format, vtitle=unit)
 
+    def _get_graph_alias(self):
+        """Returns the ASCII alias of this sensor's graph target"""
+        alias = (
+            self.human_readable.replace("\n", " ") if self.human_readable else self.name
+        )
+        # turns out graphite-web cannot handle non-ascii characters in
+        # aliases. we replace them here so we at least get a graph.
+        #
+        # https://github.com/graphite-project/graphite-web/issues/238
+        # https://github.com/graphite-project/graphite-web/pull/480
+        return alias.encode("ascii", errors="replace").decode("ascii")
+
     def get_display_range(self):
-        minimum = 0
-        if self.display_minimum_user is not None:
-            minimum = self.display_minimum_user
-        elif self.display_minimum_sys is not None:
+        minimum = self.display_minimum_user
+        if minimum is None:
             minimum = self.display_minimum_sys
+        if minimum is None:
+            minimum = 0
 
-        maximum = 100
-        if self.display_maximum_user is not None:
-            maximum = self.display_maximum_user
-        elif self.display_maximum_sys is not None:
+        maximum = self.display_maximum_user
+        if maximum is None:
             maximum = self.display_maximum_sys
-        elif self.unit_of_measurement == self.UNIT_CELSIUS:
-            maximum = 50
+        if maximum is None:
+            maximum = self._DISPLAY_MAXIMUM_DEFAULTS.get(self.unit_of_measurement, 100)
 
         return [minimum, maximum]
 
@@ -2639,6 +3048,26 @@ class Sensor(models.Model):
         return {}
 
 
+class PowerSupplyOrFanQuerySet(models.QuerySet):
+    def with_unresolved_alert_count(self):
+        """Annotates every unit with the number of its unresolved psuState or
+        fanState alerts, as unresolved_alert_count.
+        """
+        alerts = (
+            nav.models.event.AlertHistory.objects.unresolved()
+            .filter(
+                event_type__id__in=PowerSupplyOrFan.ALERT_EVENT_TYPES,
+                netbox=OuterRef('netbox'),
+                subid=Cast(OuterRef('id'), output_field=CharField()),
+            )
+            .order_by()
+            .values('netbox')
+            .annotate(count=Count('id'))
+            .values('count')
+        )
+        return self.annotate(unresolved_alert_count=Coalesce(Subquery(alerts), 0))
+
+
 class PowerSupplyOrFan(models.Model):
     STATE_UP = u'y'
     STATE_DOWN = u'n'
@@ -2651,10 +3080,13 @@ class PowerSupplyOrFan(models.Model):
         (STATE_UNKNOWN, "Unknown"),
         (STATE_WARNING, "Warning"),
     )
+    _STATE_DISPLAY = dict(STATE_CHOICES)
 
     PHYSICAL_CLASS_FAN = "fan"
     PHYSICAL_CLASS_PSU = "powerSupply"
 
+    ALERT_EVENT_TYPES = ('psuState', 'fanState')
+
     id = models.AutoField(db_column='powersupplyid', primary_key=True)
     netbox = models.ForeignKey(
         Netbox,
@@ -2676,13 +3108,17 @@ class PowerSupplyOrFan(models.Model):
     internal_id = VarcharField(db_column='internal_id', null=True)
     up = VarcharField(db_column='up', choices=STATE_CHOICES)
 
+    objects = PowerSupplyOrFanQuerySet.as_manager()
+
     class Meta(object):
         db_table = 'powersupply_or_fan'
 
     def get_unresolved_alerts(self):
         """Returns a queryset of unresolved psuState alerts for this unit"""
-        return self.netbox.get_unresolved_alerts().filter(
-            event_type__id__in=['psuState', 'fanState'], subid=self.id
+        return nav.models.event.AlertHistory.objects.unresolved().filter(
+            netbox_id=self.netbox_id,
+            event_type__id__in=self.ALERT_EVENT_TYPES,
+            subid=self.id,
         )
 
     def is_on_maintenance(self):
@@ -2699,6 +3135,9 @@ class PowerSupplyOrFan(models.Model):
         base = self.netbox.get_absolute_url()
         return base + "#!sensors"
 
+    def get_up_display(self):
+        return self._STATE_DISPLAY.get(self.up, self.up)
+
     def is_psu(self):
         return self.physical_class == self.PHYSICAL_CLASS_PSU
 
@@ -2706,6 +3145,15 @@ class PowerSupplyOrFan(models.Model):
         return self.physical_class == self.PHYSICAL_CLASS_FAN
 
 
+class UnrecognizedNeighborQuerySet(models.QuerySet):
+    def with_related(self):
+        """Selects the netbox and interface relations used to describe
+        unrecognized neighbors, so they don't need to be looked up for each
+        object.
+        """
+        return self.select_related('netbox', 'interface__netbox')
+
+
 class UnrecognizedNeighbor(models.Model):
     id = models.AutoField(primary_key=True)
     netbox = models.ForeignKey(
@@ -2726,6 +3174,8 @@ class UnrecognizedNeighbor(models.Model):
     since = models.DateTimeField(auto_now_add=True)
     ignored_since = models.DateTimeField()
 
+    objects = UnrecognizedNeighborQuerySet.as_manager()
+
     class Meta(object):
         db_table = 'unrecognized_neighbor'
         ordering = ('remote_id',)
@@ -2740,6 +3190,24 @@ class UnrecognizedNeighbor(models.Model):
         )
 
 
+class IpdevpollJobLogQuerySet(models.QuerySet):
+    def overdue(self):
+        """Filters on log entries whose next job run is overdue, as decided by
+        IpdevpollJobLog.is_overdue(), but in the database.
+        """
+        interval = ExpressionWrapper(
+            F('interval') * dt.timedelta(seconds=1), output_field=DurationField()
+        )
+        next_run = ExpressionWrapper(
+            F('end_time') + interval, output_field=DateTimeField()
+        )
+        return (
+            self.filter(interval__isnull=False)
+            .annotate(next_run=next_run)
+            .filter(next_run__lt=Now())
+        )
+
+
 class IpdevpollJobLog(models.Model):
     id = models.AutoField(primary_key=True)
     netbox = models.ForeignKey(
@@ -2755,6 +3223,8 @@ class IpdevpollJobLog(models.Model):
     success = models.BooleanField(default=False, null=True)
     interval = models.IntegerField(null=True)
 
+    objects = IpdevpollJobLogQuerySet.as_manager()
+
     class Meta(object):
         db_table = 'ipdevpoll_job_log'
 
@@ -2784,13 +3254,16 @@ class IpdevpollJobLog(models.Model):
         same netbox.
 
         """
-        try:
-            prev = IpdevpollJobLog.objects.filter(
-                netbox=self.netbox, job_name=self.job_name, end_time__lt=self.end_time
-            ).order_by('-end_time')[0]
-            return prev
-        except IndexError:
-            return None
+        return (
+            IpdevpollJobLog.objects.filter(
+                netbox_id=self.netbox_id,
+                job_name=self.job_name,
+                end_time__lt=self.end_time,
+            )
+            .only('id', 'netbox_id', 'job_name', 'end_time', 'duration', 'success')
+            .order_by('-end_time')
+            .first()
+        )
 
     def has_result(self):
         """Returns True if this job ran and had an actual result"""
@@ -2805,15 +3278,19 @@ class IpdevpollJobLog(models.Model):
         :returns: A list of lists where the first element is local seconds since
                   epoch and second element is the runtime
         """
-        jobs = IpdevpollJobLog.objects.filter(
-            job_name=self.job_name, netbox=self.netbox
-        ).order_by('-end_time')[:job_count]
-        runtimes = [
-            [int((j.end_time - dt.datetime(1970, 1, 1)).total_seconds()), j.duration]
-            for j in jobs
-        ]
-        runtimes.reverse()
-        return runtimes
+        # end_time is a timestamp without time zone, so Postgres counts the
+        # seconds from a local time epoch, just like we want
+        epoch = Cast(Floor(Extract('end_time', 'epoch')), BigIntegerField())
+        jobs = (
+            IpdevpollJobLog.objects.filter(
+                job_name=self.job_name, netbox_id=self.netbox_id
+            )
+            .annotate(epoch=epoch)
+            .order_by('-end_time')
+            .values_list('epoch', 'duration')[:job_count]
+        )
+        # lists, not tuples: templates render the result as a JS array literal
+        return [list(job) for job in reversed(list(jobs))]
 
     def get_absolute_url(self):
         """Returns the Netbox' URL"""
@@ -2836,6 +3313,35 @@ class Netbios(models.Model):
         db_table = 'netbios'
 
 
+class POEGroupQuerySet(models.QuerySet):
+    def with_relations(self):
+        """Selects the netbox and module used by POEGroup.name and
+        POEGroup.get_graph_url()
+        """
+        return self.select_related('netbox', 'module')
+
+    def with_active_ports(self):
+        """Prefetches the active ports of every POEGroup, so that
+        POEGroup.get_active_ports() doesn't need to query the database for
+        each object.
+        """
+        active_ports = POEPort.objects.filter(
+            admin_enable=True, detection_status=POEPort.STATUS_DELIVERING_POWER
+        )
+        return self.prefetch_related(
+            Prefetch('poe_ports', queryset=active_ports, to_attr='_active_ports')
+        )
+
+    def with_ports(self):
+        """Prefetches the ports of every POEGroup, along with their interfaces"""
+        return self.prefetch_related(
+            Prefetch(
+                'poe_ports',
+                queryset=POEPort.objects.select_related('interface__netbox'),
+            )
+        )
+
+
 class POEGroup(models.Model):
     """Model representing a group of power over ethernet ports"""
 
@@ -2866,14 +3372,19 @@ class POEGroup(models.Model):
     status = models.IntegerField(choices=STATUS_CHOICES)
     power = models.IntegerField()
 
+    objects = POEGroupQuerySet.as_manager()
+
     def get_graph_url(self, time_frame='1day'):
         metric = metric_path_for_power(self.netbox, self.index)
         return get_simple_graph_url([metric], time_frame=time_frame)
 
     def get_active_ports(self):
-        return self.poe_ports.filter(
-            admin_enable=True, detection_status=POEPort.STATUS_DELIVERING_POWER
-        )
+        try:
+            return self._active_ports
+        except AttributeError:
+            return self.poe_ports.filter(
+                admin_enable=True, detection_status=POEPort.STATUS_DELIVERING_POWER
+            )
 
     @property
     def name(self):
@@ -2928,6 +3439,7 @@ class POEPort(models.Model):
         (STATUS_TEST, 'test'),
         (STATUS_OTHER_FAULT, 'other fault'),
     )
+    _STATUS_DISPLAY = dict(STATUS_CHOICES)
     detection_status = models.IntegerField(choices=STATUS_CHOICES)
 
     PRIORITY_LOW = 3
@@ -2938,6 +3450,7 @@ class POEPort(models.Model):
         (PRIORITY_HIGH, 'high'),
         (PRIORITY_CRITICAL, 'critical'),
     )
+    _PRIORITY_DISPLAY = dict(PRIORITY_CHOICES)
     priority = models.IntegerField(choices=PRIORITY_CHOICES)
 
     CLASSIFICATION_CHOICES = (
@@ -2947,9 +3460,21 @@ class POEPort(models.Model):
         (4, 'class3'),
         (5, 'class4'),
     )
+    _CLASSIFICATION_DISPLAY = dict(CLASSIFICATION_CHOICES)
     classification = models.IntegerField(choices=CLASSIFICATION_CHOICES)
 
     class Meta(object):
         db_table = 'poeport'
         unique_together = (('poegroup', 'index'),)
         ordering = ('index',)
+
+    def get_detection_status_display(self):
+        return self._STATUS_DISPLAY.get(self.detection_status, self.detection_status)
+
+    def get_priority_display(self):
+        return self._PRIORITY_DISPLAY.get(self.priority, self.priority)
+
+    def get_classification_display(self):
+        return self._CLASSIFICATION_DISPLAY.get(
+            self.classification, self.classification
+        )
@@ -0,0 +1,7 @@
+-- Index job log entries by end time within each netbox and job, so that the
+-- latest entries for a netbox can be found by a single index scan.
+CREATE INDEX ipdevpoll_job_log_netboxjob_end_time_btree
+  ON ipdevpoll_job_log (netboxid, job_name, end_time DESC);
+
+-- The new index covers every lookup the old one was used for
+DROP INDEX IF EXISTS ipdevpoll_job_log_netboxjob_btree;
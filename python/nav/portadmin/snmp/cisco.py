@@ -348,7 +348,9 @@ class Cisco(SNMPHandler):
     ) -> Tuple[int, int]:
         """Returns the unit number and interface number for the given interface"""
         try:
-            poeport = manage.POEPort.objects.get(interface=interface)
+            poeport = manage.POEPort.objects.select_related('poegroup').get(
+                interface=interface
+            )
         except manage.POEPort.DoesNotExist:
             raise POENotSupportedError(
                 "This interface does not have PoE indexes defined"
@@ -95,6 +95,8 @@ class AbstractChecker(object):
             ),
         )
         self.timeout = int(timeout)
+        self._retry = int(self._conf.get('retry', 3))
+        self._retry_delay = int(self._conf.get('retry delay', 5))
         self.db = db.db()
         _logger.info("New checker instance for %s:%s ", self.sysname, self.get_type())
         self.runcount = 0
@@ -124,8 +126,8 @@ class AbstractChecker(object):
                 status = event.Event.DOWN
                 self.response_time = 2 * self.timeout
 
-        if status != self.status and (self.runcount < int(self._conf.get('retry', 3))):
-            delay = int(self._conf.get('retry delay', 5))
+        if status != self.status and self.runcount < self._retry:
+            delay = self._retry_delay
             self.runcount += 1
             _logger.info(
                 "%-20s -> State changed. New check in %i sec. (%s, " "%s)",
@@ -247,8 +249,7 @@ class AbstractChecker(object):
         return self.timestamp < getattr(obj, 'timestamp', None)
 
     def __hash__(self):
-        tup = (self.serviceid, str(self.args), self.get_address())
-        return hash(tup)
+        return hash((self.serviceid, frozenset(self.args.items()), self.get_address()))
 
     def __repr__(self):
         rep = '%i: %s %s %s' % (
@@ -14,7 +14,6 @@
 # License along with NAV. If not, see <http://www.gnu.org/licenses/>.
 #
 """Simple TCP port service checker"""
-import select
 import socket
 
 from nav.statemon.abstractchecker import AbstractChecker
@@ -33,10 +32,12 @@ class PortChecker(AbstractChecker):
 
     def execute(self):
         sock = socket.create_connection(self.get_address(), self.timeout)
-        sockfile = sock.makefile('r')
-        _readable, __w, __x = select.select([sock], [], [], self.timeout)
-        if _readable:
-            sockfile.readline()
+        try:
+            # create_connection has already applied the timeout to the socket,
+            # so we can wait for a banner without an extra select() call
+            sock.recv(1)
+        except socket.timeout:
+            pass
         status = Event.UP
         txt = 'Alive'
         sock.close()
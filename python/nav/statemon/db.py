@@ -150,16 +150,39 @@ class _DB(threading.Thread):
         while 1:
             event = self.queue.get()
             _logger.debug("Got event: [%s]", event)
-            try:
-                self.commit_event(event)
-                self.db.commit()
-            except Exception:
-                # If we fail to commit the event, place it
-                # back in our queue
-                _logger.debug("Failed to commit event, rescheduling...")
-                self.new_event(event)
+            if not self.post_event(event):
                 time.sleep(5)
 
+    def post_event(self, event):
+        """Posts a single event to the database as one transaction.
+
+        An event that cannot be posted because of an integrity error will never
+        succeed, and is thrown away. Events that fail for any other reason are
+        placed back in the queue.
+
+        :returns: False if the event was rescheduled, otherwise True.
+        """
+        try:
+            self.commit_event(event)
+            self.db.commit()
+        except psycopg2.IntegrityError:
+            _logger.critical("Database integrity error, throwing away event: %s", event)
+            self._rollback()
+        except Exception:
+            # If we fail to commit the event, place it
+            # back in our queue
+            _logger.debug("Failed to commit event, rescheduling...")
+            self._rollback()
+            self.new_event(event)
+            return False
+        return True
+
+    def _rollback(self):
+        try:
+            self.db.rollback()
+        except Exception:
+            _logger.critical("Failed to rollback")
+
     @synchronized(_queryLock)
     def query(self, statement, values=None, commit=1):
         """
@@ -210,8 +233,10 @@ class _DB(threading.Thread):
                 "Database integrity error, throwing away update", exc_info=True
             )
             _logger.debug("Tried to execute: %s", cursor.query)
-            if commit:
-                self.db.rollback()
+            self.db.rollback()
+            if not commit:
+                # the caller's transaction is lost, so the caller must know
+                raise
         except Exception:
             _logger.critical(
                 "Could not execute statement: %s",
@@ -227,14 +252,18 @@ class _DB(threading.Thread):
         self.queue.put(event)
 
     def commit_event(self, event):
-        """Commits an event to the database event queue"""
+        """Adds an event to the database event queue.
+
+        Nothing is committed here; the caller is expected to commit the
+        event's statements as a single transaction.
+        """
         if event.source not in ("serviceping", "pping"):
             _logger.critical("Invalid source for event: %s", event.source)
             return
         if event.eventtype == "version":
             statement = """UPDATE service SET version = %s
                            WHERE serviceid = %s"""
-            self.execute(statement, (event.version, event.serviceid))
+            self.execute(statement, (event.version, event.serviceid), commit=0)
             return
 
         if event.status == Event.UP:
@@ -247,7 +276,7 @@ class _DB(threading.Thread):
             value = 1
             state = 'x'
 
-        nextid = self.query("SELECT nextval('eventq_eventqid_seq')")[0][0]
+        nextid = self.query("SELECT nextval('eventq_eventqid_seq')", commit=0)[0][0]
         statement = """INSERT INTO eventq
                        (eventqid, subid, netboxid, eventtypeid,
                         state, severity, value, source, target)
@@ -263,13 +292,13 @@ class _DB(threading.Thread):
             event.source,
             "eventEngine",
         )
-        self.execute(statement, values)
+        self.execute(statement, values, commit=0)
 
         statement = """INSERT INTO eventqvar
                        (eventqid, var, val) VALUES
                        (%s, %s, %s)"""
         values = (nextid, 'descr', event.info)
-        self.execute(statement, values)
+        self.execute(statement, values, commit=0)
 
     def build_host_query(self, groups_included=None, groups_excluded=None):
         """Returns a query string and query parameters list
@@ -43,9 +43,9 @@ def get_rooms_with_position(_request, roomid=None):
     Get rooms for presentation in OSM map
     """
     if roomid:
-        rooms = Room.objects.filter(id=roomid, position__isnull=False)
+        rooms = Room.objects.list_view().filter(id=roomid, position__isnull=False)
     else:
-        rooms = Room.objects.filter(position__isnull=False)
+        rooms = Room.objects.list_view().filter(position__isnull=False)
     return _process_room_position(rooms)
 
 
@@ -54,7 +54,7 @@ def get_rooms_with_position_for_location(_request, locationid):
     Get rooms for presentation in OSM map based on location
     """
     location = Location.objects.get(pk=locationid)
-    rooms = location.get_all_rooms().filter(position__isnull=False)
+    rooms = location.get_all_rooms().filter(position__isnull=False).defer('data')
     return _process_room_position(rooms)
 
 
@@ -398,7 +398,11 @@ class NetboxViewSet(LoggerMixin, NAVAPIMixin, viewsets.ModelViewSet):
     When the filtered item is an object, it will filter on the id.
     """
 
-    queryset = manage.Netbox.objects.all().prefetch_related("info_set")
+    queryset = (
+        manage.Netbox.objects.with_common_relations()
+        .with_chassis()
+        .with_mac_addresses()
+    )
     serializer_class = serializers.NetboxSerializer
     filterset_fields = (
         'sysname',
@@ -506,7 +510,9 @@ class InterfaceViewSet(NAVAPIMixin, viewsets.ReadOnlyModelViewSet):
     Example: `/api/1/interface/?netbox=91&ifclass=trunk&ifclass=swport`
     """
 
-    queryset = manage.Interface.objects.all()
+    queryset = manage.Interface.objects.select_related(
+        'netbox', 'module__netbox', 'to_netbox', 'to_interface__netbox'
+    )
     search_fields = ('ifalias', 'ifdescr', 'ifname')
 
     # NaturalIfnameFilter returns a list, so IfClassFilter needs to come first
@@ -19,8 +19,9 @@ import datetime
 import logging
 import csv
 
+from django.core.cache import cache
 from django.db import IntegrityError
-from django.db.models import Q, Max
+from django.db.models import Count, Q, Max
 from django.http import HttpResponse
 from django.shortcuts import redirect, get_object_or_404, render
 from django.urls import reverse
@@ -43,6 +44,7 @@ from nav.metrics.data import get_netboxes_availability
 
 
 CATEGORIES = ("GW", "GSW", "SW", "EDGE")
+ROOM_META_TIMEOUT = 300
 RACK_LEFT = 0
 RACK_CENTER = 1
 RACK_RIGHT = 2
@@ -140,16 +142,24 @@ def roominfo(request, roomid):
 
 
 def get_room_meta(room):
-    """Find meta data for the room"""
-    room_interfaces = Interface.objects.filter(netbox__room=room)
-    return {
-        'devices': room.netboxes.count(),
-        'interfaces': room_interfaces.count(),
-        'interfaces_with_link': room_interfaces.filter(
-            ifoperstatus=Interface.OPER_UP
-        ).count(),
-        'trunk_interfaces': room_interfaces.filter(trunk=True).count(),
-    }
+    """Find meta data for the room.
+
+    The counts only change as ipdevpoll collects new data, so they are cached
+    for a while rather than recounted on every page view.
+    """
+    return cache.get_or_set(
+        'room_meta:' + room.id, lambda: _count_room_interfaces(room), ROOM_META_TIMEOUT
+    )
+
+
+def _count_room_interfaces(room):
+    meta = Interface.objects.filter(netbox__room=room).aggregate(
+        interfaces=Count('id'),
+        interfaces_with_link=Count('id', filter=Q(ifoperstatus=Interface.OPER_UP)),
+        trunk_interfaces=Count('id', filter=Q(trunk=True)),
+    )
+    meta['devices'] = room.netboxes.count()
+    return meta
 
 
 def render_deviceinfo(request, roomid):
@@ -224,6 +234,7 @@ def render_netboxes(request, roomid):
     for netbox in netboxes:
         netbox.interfaces_list = (
             netbox.interfaces.filter(iftype__in=Interface.ETHERNET_INTERFACE_TYPES)
+            .with_related()
             .order_by("ifindex")
             .extra(select=cam_query)
         )
@@ -254,9 +254,13 @@ class UnrecognizedNeighborSearchProvider(SearchProvider):
     link = 'Seen on'
 
     def fetch_results(self):
-        results = UnrecognizedNeighbor.objects.filter(
-            Q(remote_id__contains=self.query) | Q(remote_name__contains=self.query)
-        ).order_by('remote_id', 'remote_name')
+        results = (
+            UnrecognizedNeighbor.objects.with_related()
+            .filter(
+                Q(remote_id__contains=self.query) | Q(remote_name__contains=self.query)
+            )
+            .order_by('remote_id', 'remote_name')
+        )
 
         self.results = [
             SearchResult(result.interface.get_absolute_url(), result)
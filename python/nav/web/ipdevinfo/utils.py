@@ -15,6 +15,7 @@
 #
 """Utility methods to get extract extra characteristics from ports."""
 import logging
+from collections import defaultdict
 from datetime import datetime
 from operator import attrgetter
 
@@ -115,21 +116,26 @@ def _cache_vlan_data_in_ports(ports):
     processing multiple Interfaces at once.
 
     """
-    swpvlans = SwPortVlan.objects.filter(interface__in=ports).select_related('vlan')
-    blocked_vlans = SwPortBlocked.objects.filter(interface__in=ports)
+    vlans = defaultdict(set)
+    swpvlans = SwPortVlan.objects.filter(interface__in=ports).values_list(
+        'interface_id', 'vlan__vlan'
+    )
+    for interface_id, vlan in swpvlans:
+        vlans[interface_id].add(vlan)
+
+    blocked = defaultdict(set)
+    blocked_vlans = SwPortBlocked.objects.filter(interface__in=ports).values_list(
+        'interface_id', 'vlan'
+    )
+    for interface_id, vlan in blocked_vlans:
+        blocked[interface_id].add(vlan)
 
     for port in ports:
-        port._vlan_cache = set(
-            swpvlan.vlan.vlan for swpvlan in swpvlans if swpvlan.interface == port
-        )
+        port._vlan_cache = set(vlans[port.id])
         if port.vlan is not None:
             port._vlan_cache.add(port.vlan)
 
-        port._blocked_vlans_cache = set(
-            blocked_vlan.vlan
-            for blocked_vlan in blocked_vlans
-            if blocked_vlan.interface == port
-        )
+        port._blocked_vlans_cache = blocked[port.id]
 
 
 def _get_swportstatus_class(swport):
@@ -20,7 +20,7 @@ import datetime as dt
 
 from django.conf import settings
 from django.http import HttpResponseRedirect, Http404, HttpResponse
-from django.db.models import Q
+from django.db.models import Prefetch, Q
 from django.shortcuts import get_object_or_404, redirect, render
 from django.urls import reverse
 
@@ -365,6 +365,7 @@ def ipdev_details(request, name=None, addr=None, netbox_id=None):
             relevant_future_tasks.append(task)
 
     interfaces = netbox.interfaces.order_by('ifindex') if netbox else []
+    poe_groups = netbox.poe_groups.with_relations() if netbox else []
     for interface in interfaces:
         interface.combined_data_urls = create_combined_urls(interface, COUNTER_TYPES)
 
@@ -380,6 +381,7 @@ def ipdev_details(request, name=None, addr=None, netbox_id=None):
             'host_info': host_info,
             'netbox': netbox,
             'interfaces': interfaces,
+            'poe_groups': poe_groups,
             'counter_types': COUNTER_TYPES,
             'heading': navpath[-1][0],
             'alert_info': alert_info,
@@ -523,7 +525,9 @@ def module_details(request, netbox_sysname, module_name):
         )
 
     module = get_object_or_404(
-        Module.objects.select_related(),
+        Module.objects.select_related().prefetch_related(
+            Prefetch('poe_groups', queryset=POEGroup.objects.with_active_ports())
+        ),
         netbox__sysname=netbox_sysname,
         name=module_name,
     )
@@ -561,7 +565,7 @@ def poegroup_details(request, netbox_sysname, grpindex):
     """Show detailed view of one IP device power over ethernet group"""
 
     poegroup = get_object_or_404(
-        POEGroup.objects.select_related(),
+        POEGroup.objects.with_relations().with_ports(),
         netbox__sysname=netbox_sysname,
         index=grpindex,
     )
@@ -35,7 +35,7 @@ def index(request):
 def render_unrecognized(request):
     """Render unrecognized neighbors"""
     context = {
-        'neighbors': UnrecognizedNeighbor.objects.select_related('interface__netbox'),
+        'neighbors': UnrecognizedNeighbor.objects.with_related(),
         'page': 'unrecognized',
     }
 
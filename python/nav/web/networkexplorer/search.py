@@ -256,11 +256,15 @@ def ip_search(ip, exact=False):
 
     if exact:
         netboxes = Netbox.objects.filter(ip=ip)
-        gwportprefixes = GwPortPrefix.objects.filter(gw_ip=ip)
+        gwportprefixes = GwPortPrefix.objects.filter(gw_ip=ip).select_related(
+            'interface'
+        )
         arp_entries = Arp.objects.filter(ip=ip, end_time__gte=datetime.datetime.max)
     else:
         netboxes = Netbox.objects.filter(ip__contains=ip)
-        gwportprefixes = GwPortPrefix.objects.filter(gw_ip__contains=ip)
+        gwportprefixes = GwPortPrefix.objects.filter(gw_ip__contains=ip).select_related(
+            'interface'
+        )
         arp_entries = Arp.objects.filter(
             ip__contains=ip, end_time__gte=datetime.datetime.max
         )
@@ -353,7 +357,8 @@ def vlan_search(vlan, exact=False):
     else:
         vlan_filter = Q(vlan__vlan__icontains=vlan)
 
-    for swportvlan in SwPortVlan.objects.filter(vlan_filter):
+    swportvlans = SwPortVlan.objects.filter(vlan_filter).select_related('interface')
+    for swportvlan in swportvlans:
         swport_search = search_expand_swport(swport=swportvlan.interface)
         gwport_matches.update(swport_search[0])
         swport_matches.update(swport_search[1])
@@ -362,7 +367,10 @@ def vlan_search(vlan, exact=False):
         vlan__net_type='static'
     )
 
-    for gwportprefix in GwPortPrefix.objects.filter(prefix__in=matching_prefixes):
+    gwportprefixes = GwPortPrefix.objects.filter(
+        prefix__in=matching_prefixes
+    ).select_related('interface')
+    for gwportprefix in gwportprefixes:
         gwport_matches.add(gwportprefix.interface)
 
     for netbox in Netbox.objects.filter(netboxprefix__prefix__in=matching_prefixes):
@@ -32,7 +32,7 @@ from nav.auditlog.models import LogEntry
 from nav.django.utils import get_account
 from nav.util import is_valid_ip
 from nav.web.utils import create_title
-from nav.models.manage import Netbox, Interface
+from nav.models.manage import Netbox, Interface, SwPortAllowedVlan
 from nav.web.portadmin.utils import (
     get_and_populate_livedata,
     find_and_populate_allowed_vlans,
@@ -317,10 +317,12 @@ def fetch_voice_vlan_for_netbox(request: HttpRequest, handler: ManagementHandler
 def set_voice_vlan_attribute(voice_vlan, interfaces):
     """Set an attribute on the interfaces to indicate voice vlan behavior"""
     if voice_vlan:
-        for interface in interfaces:
-            if not interface.trunk:
-                continue
-            allowed_vlans = interface.swport_allowed_vlan.get_allowed_vlans()
+        trunks = [interface for interface in interfaces if interface.trunk]
+        if not trunks:
+            return
+        allowed = SwPortAllowedVlan.bulk_decode(trunks[0].netbox_id)
+        for interface in trunks:
+            allowed_vlans = allowed.get(interface.id, frozenset())
             interface.voice_activated = (
                 len(allowed_vlans) == 1 and voice_vlan in allowed_vlans
             )
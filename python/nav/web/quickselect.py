@@ -114,7 +114,7 @@ class QuickSelect(object):
 
             if self.netbox:
                 netboxes = {}
-                for netbox in self.netbox_set:
+                for netbox in self.netbox_set.iterator(chunk_size=2000):
                     room = room_name.get(netbox['room_id'])
                     netbox_name[netbox['id']] = self.netbox_label % netbox
                     if room in netboxes:
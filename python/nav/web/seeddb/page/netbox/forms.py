@@ -33,7 +33,14 @@ from crispy_forms_foundation.layout import (
 
 from nav.django.forms import HStoreField
 from nav.web.crispyforms import LabelSubmit, NavButton
-from nav.models.manage import Room, Category, Organization, Netbox, ManagementProfile
+from nav.models.manage import (
+    Room,
+    Category,
+    Organization,
+    Netbox,
+    NetboxType,
+    ManagementProfile,
+)
 from nav.web.seeddb.utils.edit import (
     resolve_ip_and_sysname,
     does_ip_exist,
@@ -92,6 +99,8 @@ class NetboxModelForm(forms.ModelForm):
     def __init__(self, *args, **kwargs):
         super(NetboxModelForm, self).__init__(*args, **kwargs)
         self.fields['organization'].choices = create_hierarchy(Organization)
+        # The type choices are labelled with their vendor
+        self.fields['type'].queryset = NetboxType.objects.select_related('vendor')
 
         # Master and instance related queries
         masters = [n.master.pk for n in Netbox.objects.filter(master__isnull=False)]
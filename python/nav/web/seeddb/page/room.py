@@ -107,7 +107,7 @@ def room_edit(request, action='edit', room_id=None, lat=None, lon=None):
         copy_url = None
     roompositions = [
         [float(r.position[0]), float(r.position[1])]
-        for r in Room.objects.all()
+        for r in Room.objects.list_view().filter(position__isnull=False)
         if r.position
     ]
     if room_id:
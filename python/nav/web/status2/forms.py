@@ -273,7 +273,7 @@ def get_categories():
 
 def get_organizations():
     """Get all organizations formatted as choices"""
-    return [(o.id, o.id) for o in Organization.objects.all()]
+    return [(o.id, o.id) for o in Organization.objects.list_view()]
 
 
 def get_device_groups():
@@ -283,7 +283,7 @@ def get_device_groups():
 
 def get_locations():
     """Gets all locations formatted as choices"""
-    return [(l.id, l.id) for l in Location.objects.all()]
+    return [(l.id, l.id) for l in Location.objects.list_view()]
 
 
 def get_severity():
@@ -14,18 +14,29 @@
 # along with NAV. If not, see <http://www.gnu.org/licenses/>.
 #
 """Utils for views"""
+import atexit
 import base64
 import io
 import os
-from typing import Dict, List
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Tuple
 
 from django.http import HttpResponse
 from django.views.generic.list import ListView
 
 import qrcode
-from PIL import ImageDraw, ImageFont
+from PIL import Image, ImageDraw, ImageFont
 import qrcode.image.pil
 
+from nav.compatibility import lru_cache
+
+# Smallest number of QR codes to generate in parallel
+QR_CODE_PARALLEL_THRESHOLD = 4
+# Largest number of processes to generate QR codes in
+QR_CODE_MAX_WORKERS = 8
+# Size of each QR code module, in pixels
+QR_CODE_BOX_SIZE = 10
+
 
 def get_navpath_root():
     """Returns the default navpath root
@@ -79,10 +90,20 @@ def generate_qr_code(url: str, caption: str = "") -> io.BytesIO:
 
     Returns the generated image as a bytes buffer
     """
+    return io.BytesIO(_render_qr_code_png(url, caption))
+
+
+@lru_cache(maxsize=512)
+def _render_qr_code_png(url: str, caption: str) -> bytes:
+    """Renders a captioned QR code as PNG data.
+
+    The same codes tend to be requested over and over, so the immutable PNG data is
+    cached, while every caller gets a buffer of its own.
+    """
     # Creating QR code
-    qr = qrcode.QRCode(box_size=10)
+    qr = qrcode.QRCode()
     qr.add_data(url)
-    img = qr.make_image()
+    img = _scale_qr_matrix(qr.get_matrix(), QR_CODE_BOX_SIZE)
     draw = ImageDraw.Draw(img)
 
     # Adding caption
@@ -104,10 +125,25 @@ def generate_qr_code(url: str, caption: str = "") -> io.BytesIO:
         )
 
     file_object = io.BytesIO()
-    img.save(file_object, "PNG")
+    # QR codes are two-colour images that compress well even at the fastest level
+    img.save(file_object, "PNG", compress_level=1)
     img.close()
 
-    return file_object
+    return file_object.getvalue()
+
+
+def _scale_qr_matrix(matrix: List[List[bool]], box_size: int) -> Image.Image:
+    """Scales a QR code module matrix, including its border, to a black and white
+    image.
+
+    This draws the same image as qrcode's PIL image factory, but lets PIL scale a
+    one-pixel-per-module image in C instead of drawing every dark module as a
+    separate rectangle.
+    """
+    size = len(matrix)
+    modules = Image.new("1", (size, size))
+    modules.putdata([0 if dark else 255 for row in matrix for dark in row])
+    return modules.resize((size * box_size, size * box_size), Image.NEAREST)
 
 
 def convert_bytes_buffer_to_bytes_string(bytes_buffer: io.BytesIO) -> str:
@@ -119,10 +155,38 @@ def generate_qr_codes_as_byte_strings(url_dict: Dict[str, str]) -> List[str]:
     Takes a dict of the form {name:url} and returns a list of generated QR codes as
     byte strings
     """
-    qr_code_byte_strings = []
-    for caption, url in url_dict.items():
-        qr_code_byte_buffer = generate_qr_code(url=url, caption=caption)
-        qr_code_byte_strings.append(
-            convert_bytes_buffer_to_bytes_string(bytes_buffer=qr_code_byte_buffer)
+    items = list(url_dict.items())
+    workers = _get_qr_code_workers()
+    # Generating QR codes is CPU bound, so large batches are spread over several
+    # processes. Small batches are not worth the cost of passing them around.
+    if len(items) < QR_CODE_PARALLEL_THRESHOLD or workers < 2:
+        return [_generate_qr_code_as_byte_string(item) for item in items]
+
+    chunksize = max(1, len(items) // (4 * workers))
+    return list(
+        _get_qr_code_pool().map(
+            _generate_qr_code_as_byte_string, items, chunksize=chunksize
         )
-    return qr_code_byte_strings
+    )
+
+
+def _get_qr_code_workers() -> int:
+    return min(QR_CODE_MAX_WORKERS, os.cpu_count() or 1)
+
+
+@lru_cache(maxsize=None)
+def _get_qr_code_pool() -> ProcessPoolExecutor:
+    """Returns the process pool used for generating QR codes.
+
+    The pool is created on first use and then kept for the lifetime of the process,
+    so that its worker processes are only started once.
+    """
+    pool = ProcessPoolExecutor(max_workers=_get_qr_code_workers())
+    atexit.register(pool.shutdown, wait=False)
+    return pool
+
+
+def _generate_qr_code_as_byte_string(item: Tuple[str, str]) -> str:
+    caption, url = item
+    # Encode the cached PNG data directly rather than copying it into a buffer first
+    return base64.b64encode(_render_qr_code_png(url, caption)).decode('ascii')
@@ -0,0 +1,26 @@
+from nav.models.manage import Interface, NetType, SwPortVlan, Vlan
+
+
+def test_prefetched_vlan_numbers_should_match_queried_ones(db, localhost):
+    interface = Interface(netbox=localhost, ifindex=1, ifname="eth0", vlan=10)
+    interface.save()
+    for number in (20, 30):
+        vlan = Vlan(vlan=number, net_type=NetType.objects.get(id="lan"))
+        vlan.save()
+        SwPortVlan(interface=interface, vlan=vlan).save()
+
+    prefetched = Interface.objects.with_related().get(id=interface.id)
+    assert prefetched.get_vlan_numbers() == interface.get_vlan_numbers()
+    assert prefetched.get_vlan_numbers() == [10, 20, 30]
+
+
+def test_prefetched_sorted_vlans_should_match_queried_ones(db, localhost):
+    interface = Interface(netbox=localhost, ifindex=1, ifname="eth0")
+    interface.save()
+    for number in (30, 20):
+        vlan = Vlan(vlan=number, net_type=NetType.objects.get(id="lan"))
+        vlan.save()
+        SwPortVlan(interface=interface, vlan=vlan).save()
+
+    prefetched = Interface.objects.with_related().get(id=interface.id)
+    assert list(prefetched.get_sorted_vlans()) == list(interface.get_sorted_vlans())
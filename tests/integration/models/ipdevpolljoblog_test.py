@@ -0,0 +1,21 @@
+import datetime as dt
+
+from nav.models.manage import IpdevpollJobLog
+
+
+def test_overdue_should_find_the_same_jobs_as_is_overdue(db, localhost):
+    now = dt.datetime.now()
+    for name, minutes_ago, interval in [
+        ("overdue", 10, 300),
+        ("recent", 1, 300),
+        ("unknown", 10, None),
+    ]:
+        job = IpdevpollJobLog(netbox=localhost, job_name=name, interval=interval)
+        job.save()
+        # end_time is auto_now_add, so it can only be changed after creation
+        job.end_time = now - dt.timedelta(minutes=minutes_ago)
+        job.save()
+
+    jobs = IpdevpollJobLog.objects.filter(netbox=localhost)
+    assert [job.job_name for job in jobs.overdue()] == ["overdue"]
+    assert [job.job_name for job in jobs if job.is_overdue()] == ["overdue"]
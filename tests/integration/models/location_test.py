@@ -0,0 +1,64 @@
+import pytest
+
+from nav.models.manage import Location, Organization, Room
+
+
+def test_location_descendants_should_be_returned_depth_first(db, location_tree):
+    top = Location.objects.get(id="top")
+    descendants = [location.id for location in top.get_descendants()]
+    assert descendants == ["a", "a1", "a2", "b"]
+
+
+def test_location_descendants_should_include_self_when_asked(db, location_tree):
+    top = Location.objects.get(id="a")
+    descendants = [location.id for location in top.get_descendants(True)]
+    assert descendants == ["a", "a1", "a2"]
+
+
+def test_location_without_children_should_have_no_descendants(db, location_tree):
+    assert Location.objects.get(id="b").get_descendants() == []
+
+
+def test_organization_descendants_should_be_found(db):
+    parent = Organization(id="parent")
+    parent.save()
+    Organization(id="child", parent=parent).save()
+
+    assert [org.id for org in parent.get_descendants()] == ["child"]
+
+
+def test_get_all_rooms_should_include_rooms_of_sublocations(db, location_tree):
+    Room(id="room-a1", location=Location.objects.get(id="a1")).save()
+    Room(id="room-b", location=Location.objects.get(id="b")).save()
+
+    rooms = Location.objects.get(id="a").get_all_rooms()
+    assert [room.id for room in rooms] == ["room-a1"]
+
+
+def test_num_ancestors_should_count_all_ancestors(db, location_tree):
+    assert Location.objects.get(id="a1").num_ancestors() == 2
+    assert Location.objects.get(id="b").num_ancestors() == 1
+    assert Location.objects.get(id="top").num_ancestors() == 0
+
+
+def test_num_ancestors_should_follow_changed_parent(db, location_tree):
+    location = Location.objects.get(id="a1")
+    assert location.num_ancestors() == 2
+    location.parent = Location.objects.get(id="top")
+    assert location.num_ancestors() == 1
+
+
+def test_list_view_should_defer_data(db, location_tree):
+    location = Location.objects.list_view().get(id="top")
+    assert "data" in location.get_deferred_fields()
+
+
+@pytest.fixture
+def location_tree(db):
+    top = Location(id="top")
+    top.save()
+    a = Location(id="a", parent=top)
+    a.save()
+    Location(id="b", parent=top).save()
+    Location(id="a2", parent=a).save()
+    Location(id="a1", parent=a).save()
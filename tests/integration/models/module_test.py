@@ -0,0 +1,34 @@
+from nav.models.manage import Device, Module, NetboxEntity
+
+
+def test_get_chassis_should_return_chassis_containing_module(db, localhost):
+    chassis = _make_entity(localhost, 1, NetboxEntity.CLASS_CHASSIS, None)
+    slot = _make_entity(localhost, 2, NetboxEntity.CLASS_CONTAINER, chassis)
+    module_entity = _make_entity(localhost, 3, NetboxEntity.CLASS_MODULE, slot)
+    module = Module(netbox=localhost, device=module_entity.device, name="1")
+    module.save()
+
+    assert module.get_chassis() == chassis
+
+
+def test_when_module_has_no_entity_get_chassis_should_return_none(db, localhost):
+    device = Device(serial="lonely")
+    device.save()
+    module = Module(netbox=localhost, device=device, name="1")
+    module.save()
+
+    assert module.get_chassis() is None
+
+
+def _make_entity(netbox, index, physical_class, contained_in):
+    device = Device(serial="serial-{}".format(index))
+    device.save()
+    entity = NetboxEntity(
+        netbox=netbox,
+        index=index,
+        physical_class=physical_class,
+        contained_in=contained_in,
+        device=device,
+    )
+    entity.save()
+    return entity
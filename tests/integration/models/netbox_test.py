@@ -4,6 +4,7 @@ from nav.models.manage import (
     ManagementProfile,
     NetboxProfile,
     NetboxEntity,
+    NetboxInfo,
     Netbox,
     Device,
 )
@@ -36,3 +37,28 @@ def test_netbox_mac_addresses_should_return_distinct_set_of_addresses(
     localhost.info_set.create(key="bridge_info", variable="base_address", value=mac)
 
     assert localhost.mac_addresses == set([mac])
+
+
+def test_netboxinfo_cache_set_many_should_store_retrievable_values(
+    db, localhost: Netbox
+):
+    NetboxInfo.cache_set(localhost, "test", "existing", "old value")
+    NetboxInfo.cache_set_many(
+        localhost,
+        [("test", "existing", {"new": "value"}), ("test", "created", [1, 2, 3])],
+    )
+
+    assert NetboxInfo.cache_get(localhost, "test", "existing") == {"new": "value"}
+    assert NetboxInfo.cache_get(localhost, "test", "created") == [1, 2, 3]
+    assert localhost.info_set.filter(key="test").count() == 2
+
+
+def test_netboxes_annotated_with_mac_addresses_should_have_distinct_set_of_addresses(
+    db, localhost: Netbox
+):
+    mac = "00:c0:ff:ee:ba:be"
+    localhost.info_set.create(key="lldp", variable="chassis_mac", value=mac)
+    localhost.info_set.create(key="bridge_info", variable="base_address", value=mac)
+
+    netbox = Netbox.objects.with_mac_addresses().get(id=localhost.id)
+    assert netbox.mac_addresses == set([mac])
@@ -0,0 +1,24 @@
+from nav.models.manage import Prefix, Vlan
+
+
+def test_contains_ip_should_return_prefixes_by_descending_mask_length(db):
+    vlan = Vlan(vlan=10, net_type_id='lan')
+    vlan.save()
+    for net_address in ('10.0.0.0/8', '10.1.0.0/16', '10.1.2.0/24', '10.2.0.0/16'):
+        Prefix(net_address=net_address, vlan=vlan).save()
+
+    prefixes = Prefix.objects.contains_ip('10.1.2.3')
+    assert [p.net_address for p in prefixes] == [
+        '10.1.2.0/24',
+        '10.1.0.0/16',
+        '10.0.0.0/8',
+    ]
+    assert [p.mlen for p in prefixes] == [24, 16, 8]
+
+
+def test_contains_ip_should_not_return_loopback_prefixes(db):
+    vlan = Vlan(vlan=10, net_type_id='loopback')
+    vlan.save()
+    Prefix(net_address='10.1.2.3/32', vlan=vlan).save()
+
+    assert not Prefix.objects.contains_ip('10.1.2.3').exists()
@@ -1,5 +1,14 @@
 # -*- coding: utf-8 -*-
-from nav.django.utils import get_verbose_name, reverse_with_query
+from mock import patch
+
+from nav.django.utils import (
+    _clear_default_account_cache,
+    _default_account_row,
+    default_account,
+    get_verbose_name,
+    reverse_with_query,
+)
+from nav.models.profiles import Account
 
 
 def test_verbose_name():
@@ -13,3 +22,41 @@ def test_verbose_name():
 def test_reverse_with_query_should_work_with_unicode():
     """Reveals issues with PY2/PY3 co-compatibility"""
     assert reverse_with_query("maintenance-new", roomid=u"bø-123")
+
+
+class TestDefaultAccount:
+    def setup_method(self):
+        _default_account_row.cache_clear()
+
+    def teardown_method(self):
+        _default_account_row.cache_clear()
+
+    def test_should_only_query_database_once(self):
+        with patch.object(Account.objects, 'filter') as filter_:
+            filter_.return_value.db = 'default'
+            filter_.return_value.values.return_value.get.return_value = {
+                'id': Account.DEFAULT_ACCOUNT,
+                'login': 'anonymous',
+                'name': 'Anonymous user',
+                'password': '',
+                'ext_sync': '',
+                'preferences': {},
+            }
+            first = default_account()
+            second = default_account()
+
+        assert filter_.call_count == 1
+        assert first.login == second.login == 'anonymous'
+        assert first is not second
+        assert first.preferences is not second.preferences
+
+    def test_saving_default_account_should_clear_cache(self):
+        with patch.object(Account.objects, 'filter') as filter_:
+            filter_.return_value.values.return_value.get.return_value = {
+                'id': Account.DEFAULT_ACCOUNT
+            }
+            default_account()
+            _clear_default_account_cache(Account, Account(id=Account.DEFAULT_ACCOUNT))
+            default_account()
+
+        assert filter_.call_count == 2
@@ -73,6 +73,11 @@ class IgnoredPrefixTest(TestCase):
         self.assertTrue(pfx.matches('192.168.1.0/24'))
         self.assertFalse(pfx.matches('192.168.1.128/25'))
 
+    def test_match_should_accept_ip_objects(self):
+        pfx = prefix.IgnoredPrefix('192.168.1.0/24')
+        self.assertTrue(pfx.matches(IP('192.168.1.128/25')))
+        self.assertFalse(pfx.matches(IP('fe80::/64')))
+
 
 class PrefixPluginTest(TestCase):
     def test_instantiation(self):
@@ -104,3 +109,19 @@ class VlanPatternTest(TestCase):
     def test_checkpoint_vlan_names_should_match(self):
         match = prefix.VLAN_PATTERN.match("bond0." + self.vlan)
         self.assertEqual(match.group('vlan'), self.vlan)
+
+
+class ParseVlanInterfacesTest(TestCase):
+    def test_should_parse_vlan_from_matching_names(self):
+        interfaces = {
+            1: 'Vlan10',
+            2: 'vl20',
+            3: 'irb.30',
+            4: 'reth0.40',
+            5: 'bond1.50',
+            6: 'GigabitEthernet0/1',
+        }
+        self.assertEqual(
+            prefix.parse_vlan_interfaces(interfaces),
+            {1: 10, 2: 20, 3: 30, 4: 40, 5: 50},
+        )
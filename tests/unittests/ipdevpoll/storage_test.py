@@ -1,4 +1,4 @@
-from nav.ipdevpoll.storage import get_shadow_sort_order
+from nav.ipdevpoll.storage import ContainerRepository, get_shadow_sort_order
 from nav.ipdevpoll import shadows
 
 
@@ -8,3 +8,11 @@ from nav.ipdevpoll import shadows
 def test_netboxinfo_should_always_sort_last():
     classes = get_shadow_sort_order()
     assert classes[-1] is shadows.NetboxInfo
+
+
+def test_factory_should_return_existing_container_for_same_key():
+    containers = ContainerRepository()
+    first = containers.factory(1, shadows.Interface)
+    assert containers.factory(1, shadows.Interface) is first
+    assert containers.factory(2, shadows.Interface) is not first
+    assert containers.get(1, shadows.Interface) is first
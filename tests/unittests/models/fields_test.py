@@ -146,6 +146,11 @@ class TestDictAsJsonField(object):
         result = field.get_prep_value({'a': 'b'})
         assert result == u'{"a": "b"}'
 
+    def test_from_db_value_json(self):
+        field = DictAsJsonField()
+        result = field.from_db_value('{"a": 1}', None, None)
+        assert result == {"a": 1}
+
 
 class TestLegacyGenericForeignKey(object):
     def test_get_model_class_unknown_model(self):
@@ -166,6 +171,16 @@ class TestPointField(object):
         point = field.to_python(point_string)
         assert expected_point == point
 
+    def test_from_db_value(self):
+        expected_point = (Decimal("60.3968"), Decimal("5.3241"))
+        field = PointField()
+        point = field.from_db_value("(60.3968,5.3241)", None, None)
+        assert expected_point == point
+
+    def test_from_db_value_null(self):
+        field = PointField()
+        assert field.from_db_value(None, None, None) is None
+
     def get_db_prep_value(self):
         expected_db_string = "(7.1,5.12)"
         point = (Decimal("7.1"), Decimal("5.12"))
@@ -0,0 +1,40 @@
+from unittest.mock import patch
+
+import pytest
+
+from nav.models.manage import Interface, Netbox, SwPortAllowedVlan
+
+
+class TestShortSysname:
+    def test_when_netbox_is_loaded_it_should_not_query(self):
+        interface = Interface(ifname="Gi1/1", netbox=Netbox(sysname="sw1"))
+        with patch.object(Netbox.objects, "values_list") as values_list:
+            assert interface.audit_logname == "sw1:Gi1/1"
+            values_list.assert_not_called()
+
+    def test_when_netbox_is_not_loaded_it_should_only_query_once(self):
+        interface = Interface(ifname="Gi1/1", netbox_id=1)
+        with patch.object(Netbox.objects, "values_list") as values_list:
+            values_list.return_value.get.return_value = ("sw1", "10.0.0.1")
+            assert str(interface) == "Gi1/1 at sw1"
+            assert interface.audit_logname == "sw1:Gi1/1"
+            assert values_list.call_count == 1
+
+
+class TestGetTrunkvlansAsRange:
+    @pytest.mark.parametrize(
+        "vlans, expected",
+        [
+            ([10], "10"),
+            ([1, 2, 3, 4, 7, 8, 10], "1-4,7-8,10"),
+            ([4094, 1, 3, 2], "1-3,4094"),
+        ],
+    )
+    def test_should_collapse_consecutive_vlans(self, vlans, expected):
+        interface = Interface(trunk=True)
+        allowed = SwPortAllowedVlan(interface=interface)
+        allowed.set_allowed_vlans(vlans)
+        assert interface.get_trunkvlans_as_range() == expected
+
+    def test_when_not_a_trunk_it_should_return_empty_string(self):
+        assert Interface(trunk=False).get_trunkvlans_as_range() == ""
@@ -0,0 +1,80 @@
+from unittest.mock import patch
+
+from nav.models.manage import Module, NetboxEntity
+
+import pytest
+
+
+class TestGetEntity:
+    def test_should_only_query_once(self, entities):
+        module = Module(id=1, netbox_id=1, device_id=10)
+        with patch.object(NetboxEntity.objects, "filter") as filter:
+            filter.return_value.first.return_value = entities[1]
+            assert module.get_entity() == entities[1]
+            assert module.get_entity() == entities[1]
+            assert filter.call_count == 1
+
+    def test_when_device_changes_it_should_query_again(self, entities):
+        module = Module(id=1, netbox_id=1, device_id=10)
+        with patch.object(NetboxEntity.objects, "filter") as filter:
+            filter.return_value.first.return_value = entities[1]
+            module.get_entity()
+            module.device_id = 20
+            filter.return_value.first.return_value = entities[2]
+            assert module.get_entity() == entities[2]
+            assert filter.call_count == 2
+
+
+class TestIsOnMaintenance:
+    def test_when_annotated_it_should_not_look_up_the_netbox(self):
+        module = Module(id=1, netbox_id=1, device_id=10)
+        module._on_maintenance = True
+        with patch.object(Module, "netbox") as netbox:
+            assert module.is_on_maintenace()
+            netbox.is_on_maintenance.assert_not_called()
+
+    def test_when_not_annotated_it_should_ask_the_netbox(self):
+        module = Module(id=1, netbox_id=1, device_id=10)
+        with patch.object(Module, "netbox") as netbox:
+            netbox.is_on_maintenance.return_value = False
+            assert not module.is_on_maintenace()
+            netbox.is_on_maintenance.assert_called_once()
+
+
+@pytest.fixture
+def entities():
+    return [
+        NetboxEntity(
+            id=1, netbox_id=1, physical_class=NetboxEntity.CLASS_CHASSIS, device_id=1
+        ),
+        NetboxEntity(
+            id=2,
+            netbox_id=1,
+            physical_class=NetboxEntity.CLASS_MODULE,
+            contained_in_id=1,
+            device_id=10,
+        ),
+        NetboxEntity(
+            id=3,
+            netbox_id=1,
+            physical_class=NetboxEntity.CLASS_MODULE,
+            contained_in_id=2,
+            device_id=20,
+        ),
+    ]
+
+
+class TestPortGetters:
+    def test_all_port_getters_should_select_module_and_netbox(self):
+        module = Module(id=1, netbox_id=1)
+        for getter in (
+            module.get_gwports,
+            module.get_swports,
+            module.get_physical_ports,
+        ):
+            assert getter().query.select_related == {'module': {}, 'netbox': {}}
+
+    def test_gwports_should_prefetch_prefixes(self):
+        module = Module(id=1, netbox_id=1)
+        lookups = module.get_gwports()._prefetch_related_lookups
+        assert [lookup.prefetch_to for lookup in lookups] == ['gwport_prefixes']
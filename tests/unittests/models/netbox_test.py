@@ -1,6 +1,6 @@
-from unittest.mock import patch
+from unittest.mock import Mock, patch
 
-from nav.models.manage import Netbox, ManagementProfile
+from nav.models.manage import Netbox, NetboxEntity, ManagementProfile
 
 import pytest
 
@@ -34,6 +34,88 @@ class TestGetPreferredSnmpProfiles:
         profile = mocked_netbox.get_preferred_snmp_management_profile()
         assert profile.name == "v3 write"
 
+    def test_when_called_twice_it_should_see_changed_profiles(self, mocked_netbox):
+        mocked_netbox.get_preferred_snmp_management_profile()
+        mocked_netbox.profiles.filter.return_value = []
+        assert mocked_netbox.get_preferred_snmp_management_profile() is None
+
+    def test_when_no_profiles_exist_it_should_return_none(self, mocked_netbox):
+        mocked_netbox.profiles.filter.return_value = []
+        assert mocked_netbox.get_preferred_snmp_management_profile() is None
+
+
+class TestManagementProfileSnmpVersion:
+    def test_when_version_is_changed_it_should_return_the_new_version(self):
+        profile = ManagementProfile(
+            protocol=ManagementProfile.PROTOCOL_SNMP, configuration={"version": 1}
+        )
+        assert profile.snmp_version == 1
+        profile.configuration["version"] = "2c"
+        assert profile.snmp_version == 2
+
+    def test_when_version_is_missing_it_should_log_an_error(self):
+        profile = ManagementProfile(
+            name="broken", protocol=ManagementProfile.PROTOCOL_SNMP, configuration={}
+        )
+        with patch("nav.models.manage._logger") as logger:
+            assert profile.snmp_version is None
+            assert logger.error.call_count == 1
+
+    def test_when_profile_is_not_snmp_it_should_raise(self):
+        profile = ManagementProfile(protocol=ManagementProfile.PROTOCOL_NAPALM)
+        with pytest.raises(ValueError):
+            profile.snmp_version
+
+
+class TestGetShortSysname:
+    def test_when_sysname_changes_it_should_return_the_new_short_sysname(self):
+        with patch("nav.models.manage.settings.DOMAIN_SUFFIX", ".example.org"):
+            netbox = Netbox(sysname="foo.example.org", ip="127.0.0.1")
+            assert netbox.get_short_sysname() == "foo"
+            netbox.sysname = "bar.example.org"
+            assert netbox.get_short_sysname() == "bar"
+
+    def test_when_sysname_is_empty_it_should_return_ip(self):
+        netbox = Netbox(sysname="", ip="127.0.0.1")
+        assert netbox.get_short_sysname() == "127.0.0.1"
+
+
+class TestNetboxEntityGetParentIds:
+    def test_should_return_parents_starting_with_the_closest_one(self):
+        entity = NetboxEntity(id=4, contained_in_id=3)
+        parent_map = {1: None, 2: 1, 3: 2, 4: 3}
+        assert entity._get_parent_ids(parent_map) == [3, 2, 1]
+
+    def test_when_entity_has_no_parent_it_should_return_empty_list(self):
+        entity = NetboxEntity(id=1, contained_in_id=None)
+        assert entity._get_parent_ids({1: None}) == []
+
+    def test_when_containment_is_circular_it_should_not_loop_forever(self):
+        entity = NetboxEntity(id=3, contained_in_id=1)
+        parent_map = {1: 2, 2: 1, 3: 1}
+        assert entity._get_parent_ids(parent_map) == [1, 2]
+
+
+class TestNetboxDevice:
+    def test_when_chassis_is_prefetched_it_should_not_query(self):
+        netbox = Netbox(sysname="test", ip="127.0.0.1")
+        entity = Mock(device="first")
+        netbox._chassis_entities = [entity, Mock(device="second")]
+        with patch.object(Netbox, "get_chassis") as get_chassis:
+            assert netbox.device == "first"
+            get_chassis.assert_not_called()
+
+    def test_when_prefetched_chassis_list_is_empty_it_should_return_none(self):
+        netbox = Netbox(sysname="test", ip="127.0.0.1")
+        netbox._chassis_entities = []
+        assert netbox.device is None
+
+    def test_when_chassis_is_prefetched_get_chassis_should_return_it(self):
+        netbox = Netbox(sysname="test", ip="127.0.0.1")
+        chassis = [Mock(device="first")]
+        netbox._chassis_entities = chassis
+        assert netbox.get_chassis() is chassis
+
 
 @pytest.fixture
 def mocked_netbox(mock_profiles):
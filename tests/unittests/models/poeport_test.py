@@ -0,0 +1,16 @@
+from nav.models.manage import POEPort
+
+
+def test_poeport_displays_should_match_choices():
+    for status, display in POEPort.STATUS_CHOICES:
+        port = POEPort(detection_status=status)
+        assert port.get_detection_status_display() == display
+    for priority, display in POEPort.PRIORITY_CHOICES:
+        assert POEPort(priority=priority).get_priority_display() == display
+    for classification, display in POEPort.CLASSIFICATION_CHOICES:
+        port = POEPort(classification=classification)
+        assert port.get_classification_display() == display
+
+
+def test_poeport_unknown_status_should_be_displayed_as_is():
+    assert POEPort(detection_status=42).get_detection_status_display() == 42
@@ -1,3 +1,5 @@
+import pytest
+
 from nav.models.manage import Sensor
 
 
@@ -5,3 +7,37 @@ def test_sensor_normalized_units_should_accept_blank_units():
     """Some sensors just count things that have no unit of measurement"""
     sensor = Sensor(unit_of_measurement=None)
     assert sensor.normalized_unit == ""
+
+
+def test_sensor_data_scale_display_should_match_choices():
+    for scale, display in Sensor.DATA_SCALE_CHOICES:
+        assert Sensor(data_scale=scale).get_data_scale_display() == display
+
+
+def test_sensor_unknown_unit_should_be_displayed_as_is():
+    sensor = Sensor(unit_of_measurement="furlongs")
+    assert sensor.get_unit_of_measurement_display() == "furlongs"
+
+
+@pytest.mark.parametrize(
+    "attrs, expected",
+    [
+        (dict(), [0, 100]),
+        (dict(unit_of_measurement=Sensor.UNIT_CELSIUS), [0, 50]),
+        (dict(display_minimum_sys=-10, display_maximum_sys=10), [-10, 10]),
+        (
+            dict(
+                display_minimum_sys=-10,
+                display_minimum_user=0,
+                display_maximum_sys=10,
+                display_maximum_user=5,
+                unit_of_measurement=Sensor.UNIT_CELSIUS,
+            ),
+            [0, 5],
+        ),
+    ],
+)
+def test_sensor_display_range_should_prefer_user_then_sys_then_defaults(
+    attrs, expected
+):
+    assert Sensor(**attrs).get_display_range() == expected
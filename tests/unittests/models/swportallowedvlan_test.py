@@ -0,0 +1,66 @@
+from unittest.mock import patch
+
+import pytest
+
+from nav.bitvector import BitVector
+from nav.models.manage import SwPortAllowedVlan
+
+
+class TestGetAllowedVlans:
+    @pytest.mark.parametrize(
+        "vlans",
+        [
+            [1],
+            [0, 7, 8, 15],
+            [1, 10, 20, 30, 1000, 4095],
+            list(range(100, 200)),
+        ],
+    )
+    def test_should_decode_the_vlans_that_were_encoded(self, vlans):
+        allowed = SwPortAllowedVlan()
+        allowed.set_allowed_vlans(vlans)
+        assert allowed.get_allowed_vlans() == set(vlans)
+
+    def test_should_decode_like_bitvector(self):
+        hex_string = "7f" + "00" * 20 + "a5c3" + "ff" * 3
+        allowed = SwPortAllowedVlan(hex_string=hex_string)
+        expected = BitVector(bytes.fromhex(hex_string)).get_set_bits()
+        assert allowed.get_allowed_vlans() == set(expected)
+
+    def test_when_hex_string_changes_it_should_return_the_new_vlans(self):
+        allowed = SwPortAllowedVlan()
+        allowed.set_allowed_vlans([1, 2])
+        assert allowed.get_allowed_vlans() == {1, 2}
+        allowed.set_allowed_vlans([3])
+        assert allowed.get_allowed_vlans() == {3}
+
+    def test_when_hex_string_is_empty_it_should_return_empty_set(self):
+        assert SwPortAllowedVlan(hex_string="").get_allowed_vlans() == set()
+
+
+class TestVlanListToHex:
+    @pytest.mark.parametrize("vlans", [[1], [0, 7, 8, 15], [1, 1000, 4095], [1025]])
+    def test_should_encode_like_bitvector(self, vlans):
+        needed_octets = max(vlans) // 8 + 1
+        bits = BitVector(b'\x00' * max(needed_octets, 128))
+        for vlan in vlans:
+            bits[vlan] = True
+        assert SwPortAllowedVlan.vlan_list_to_hex(vlans) == bits.to_hex()
+
+    def test_should_encode_at_least_128_octets(self):
+        assert len(SwPortAllowedVlan.vlan_list_to_hex([1])) == 256
+
+
+class TestBulkDecode:
+    def test_should_decode_all_rows_from_a_single_query(self):
+        rows = [
+            (1, SwPortAllowedVlan.vlan_list_to_hex([10, 20])),
+            (2, SwPortAllowedVlan.vlan_list_to_hex([10, 20])),
+            (3, ""),
+        ]
+        with patch.object(SwPortAllowedVlan.objects, "filter") as filter:
+            filter.return_value.values_list.return_value = rows
+            result = SwPortAllowedVlan.bulk_decode(42)
+            filter.assert_called_once_with(interface__netbox_id=42)
+
+        assert result == {1: {10, 20}, 2: {10, 20}, 3: frozenset()}
@@ -0,0 +1,28 @@
+from unittest.mock import patch
+
+from nav.models.manage import Vlan
+
+
+class TestGetGraphUrls:
+    def test_should_query_prefixes_only_once(self):
+        vlan = Vlan(vlan=10)
+        addresses = ["10.0.0.0/24", "fe80::/64"]
+        with patch.object(Vlan, "prefixes") as manager:
+            manager.values_list.return_value = addresses
+            with patch("nav.models.manage.get_simple_graph_url") as graph_url:
+                graph_url.side_effect = lambda series, **kwargs: series
+                urls = vlan.get_graph_urls()
+            assert manager.values_list.call_count == 1
+
+        v4_series, v6_series = urls
+        assert len(v4_series) == 2
+        assert "10.0.0.0/24" in v4_series[0]
+        assert "Max addresses" in v4_series[1]
+        assert len(v6_series) == 1
+        assert "fe80::/64" in v6_series[0]
+
+    def test_when_vlan_has_no_prefixes_it_should_return_no_urls(self):
+        vlan = Vlan(vlan=10)
+        with patch.object(Vlan, "prefixes") as manager:
+            manager.values_list.return_value = []
+            assert vlan.get_graph_urls() == []
@@ -29,3 +29,22 @@ def test_natsort_splits_can_be_sorted():
         shuffle(data)
         result = sorted(data, key=natsort.split)
         assert result == expected
+
+
+def test_natsort_sort_key_should_sort_like_split():
+    data = [
+        "Gi1/0/10",
+        "Gi1/0/2",
+        "Gi1/0/1",
+        "Te1/1/1",
+        "10",
+        "2",
+        "ge-0/0/0",
+        "ge-0/0/0.100",
+        "",
+        "vlan10",
+        "vlan",
+    ]
+    for i in range(5):
+        shuffle(data)
+        assert sorted(data, key=natsort.sort_key) == sorted(data, key=natsort.split)
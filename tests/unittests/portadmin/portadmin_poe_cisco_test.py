@@ -61,7 +61,10 @@ class TestGetPoeState:
 
 @pytest.fixture()
 def poeport_get_mock():
-    with patch("nav.portadmin.snmp.cisco.manage.POEPort.objects.get") as get_mock:
+    with patch(
+        "nav.portadmin.snmp.cisco.manage.POEPort.objects.select_related"
+    ) as select_related_mock:
+        get_mock = select_related_mock.return_value.get
         poegroup_mock = Mock(index=1)
         poeport_mock = Mock(poegroup=poegroup_mock, index=1)
         get_mock.return_value = poeport_mock
@@ -70,6 +73,9 @@ def poeport_get_mock():
 
 @pytest.fixture()
 def poeport_get_mock_error():
-    with patch("nav.portadmin.snmp.cisco.manage.POEPort.objects.get") as get_mock:
+    with patch(
+        "nav.portadmin.snmp.cisco.manage.POEPort.objects.select_related"
+    ) as select_related_mock:
+        get_mock = select_related_mock.return_value.get
         get_mock.side_effect = manage.POEPort.DoesNotExist
         yield get_mock
@@ -1,7 +1,11 @@
 # Copyright (C) 2020 Universitetet i Oslo
 
-from nav.statemon.db import db
+from nav.statemon.db import db, _DB
 from unittest import TestCase
+from unittest.mock import Mock, patch
+
+import psycopg2
+import pytest
 
 
 class DBTestcase(TestCase):
@@ -58,3 +62,37 @@ class DBTestcase(TestCase):
         self.assertListEqual(params, [])
         # Check the query string is correct
         self.assertEqual(query, query_no_groups)
+
+
+class TestPostEvent:
+    def test_when_integrity_error_occurs_event_should_be_discarded(self):
+        database = _DB()
+        database.db = Mock()
+        event = Mock()
+        with patch.object(
+            database, "commit_event", side_effect=psycopg2.IntegrityError
+        ):
+            assert database.post_event(event)
+        database.db.rollback.assert_called_once()
+        database.db.commit.assert_not_called()
+        assert database.queue.empty()
+
+    def test_when_other_error_occurs_event_should_be_rescheduled(self):
+        database = _DB()
+        database.db = Mock()
+        event = Mock()
+        with patch.object(database, "commit_event", side_effect=ValueError):
+            assert not database.post_event(event)
+        database.db.rollback.assert_called_once()
+        assert database.queue.get_nowait() is event
+
+    def test_execute_without_commit_should_reraise_integrity_error(self):
+        database = _DB()
+        database.db = Mock()
+        database.db.cursor.return_value.execute.side_effect = [
+            None,  # the connection check in cursor()
+            psycopg2.IntegrityError,
+        ]
+        with pytest.raises(psycopg2.IntegrityError):
+            database.execute("INSERT INTO eventq VALUES (1)", commit=0)
+        database.db.rollback.assert_called_once()
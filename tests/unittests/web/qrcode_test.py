@@ -1,11 +1,26 @@
 import io
+from unittest.mock import patch
 
-from nav.web.utils import generate_qr_code, generate_qr_codes_as_byte_strings
+from nav.web.utils import (
+    _get_qr_code_pool,
+    generate_qr_code,
+    generate_qr_codes_as_byte_strings,
+)
 
 
 def test_generate_qr_code_returns_byte_buffer():
     qr_code = generate_qr_code(url="www.example.com", caption="buick.lab.uninett.no")
     assert isinstance(qr_code, io.BytesIO)
+    assert qr_code.getvalue().startswith(b"\x89PNG\r\n\x1a\n")
+
+
+def test_generate_qr_code_should_return_independent_buffers_with_same_content():
+    first = generate_qr_code(url="www.example.com", caption="buick.lab.uninett.no")
+    first.read()
+    second = generate_qr_code(url="www.example.com", caption="buick.lab.uninett.no")
+    assert second is not first
+    assert second.tell() == 0
+    assert second.getvalue() == first.getvalue()
 
 
 def test_generate_qr_codes_as_byte_strings_returns_list_of_byte_strings():
@@ -14,3 +29,22 @@ def test_generate_qr_codes_as_byte_strings_returns_list_of_byte_strings():
     )
     assert isinstance(qr_codes, list)
     assert isinstance(qr_codes[0], str)
+
+
+def test_generate_qr_codes_as_byte_strings_should_preserve_order():
+    url_dict = {"host%d.example.org" % i: "www.example.com/%d" % i for i in range(5)}
+    expected = [
+        generate_qr_codes_as_byte_strings({caption: url})[0]
+        for caption, url in url_dict.items()
+    ]
+    with patch("os.cpu_count", return_value=2):
+        assert generate_qr_codes_as_byte_strings(url_dict) == expected
+
+
+def test_generate_qr_codes_as_byte_strings_should_reuse_process_pool():
+    url_dict = {"host%d.example.org" % i: "www.example.com/%d" % i for i in range(5)}
+    with patch("os.cpu_count", return_value=2):
+        generate_qr_codes_as_byte_strings(url_dict)
+        pool = _get_qr_code_pool()
+        generate_qr_codes_as_byte_strings(url_dict)
+        assert _get_qr_code_pool() is pool